@@ -0,0 +1,311 @@
+# Wall clock and peak memory of the history pipeline on synthetic repositories:
+#
+#     python benchmarks/history.py [--commits 1000,10000] [--tag-every 100] [--body-lines 2]
+#         [--footer-mix closes=0.2,breaking=0.01,revert=0.005] [--runs 3] [--json]
+#
+# The repositories are written with "git fast-import" from a seeded generator, so the same
+# parameters always give the same commits and hashes. Commits with a footer also get
+# --body-lines body lines. The repositories are kept in --work-dir and only built once.
+# Every case runs in a fresh interpreter: the best and the median wall clock of --runs runs
+# are reported in ms, then one more run reports the peak of tracemalloc and the maximum
+# resident set size of the process in MiB.
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import IO
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import Callable
+
+if TYPE_CHECKING:
+    from cz.config import CommitizenConfig
+
+ROOT = Path(__file__).resolve().parent.parent
+COMMIT_TYPES = ["feat", "fix", "fix", "docs", "refactor", "perf", "chore", "test"]
+FOOTERS = ("breaking", "closes", "revert")  # the order the default config expects
+START_TIME = 1600000000
+
+
+class RepositorySpec:
+    def __init__(
+        self, commits: int, tag_every: int, body_lines: int, footer_mix: dict[str, float]
+    ) -> None:
+        self.commits = commits
+        self.tag_every = tag_every
+        self.body_lines = body_lines
+        self.footer_mix = footer_mix
+
+    @property
+    def name(self) -> str:
+        mix = "-".join(f"{name}{self.footer_mix.get(name, 0)}" for name in FOOTERS)
+        return f"c{self.commits}-t{self.tag_every}-b{self.body_lines}-{mix}"
+
+    def versions(self) -> list[str]:
+        return [f"{i // 100}.{i % 100}.0" for i in range(1, self.commits // self.tag_every + 1)]
+
+    def write_stream(self, stream: IO[bytes]) -> None:
+        rnd = random.Random(self.name)
+        versions = iter(self.versions())
+        latest = f"{self.versions()[-1] if self.versions() else '0.0.0'}"
+        for i in range(1, self.commits + 1):
+            files = f"M 100644 inline data.txt\ndata {len(f'{i}')}\n{i}\n"
+            if i == 1:
+                pyproject = f'[tool.poetry]\nname = "demo"\nversion = "{latest}"\n'
+                module = f'__version__ = "{latest}"\n'
+                files += f"M 100644 inline pyproject.toml\ndata {len(pyproject)}\n{pyproject}\n"
+                files += f"M 100644 inline demo/__version__.py\ndata {len(module)}\n{module}\n"
+            message = self.message(rnd, i).encode("utf-8")
+            timestamp = START_TIME + i * 60
+            stream.write(
+                f"commit refs/heads/main\nmark :{i}\n"
+                f"author A{i % 7} <a{i % 7}@example.com> {timestamp} +0000\n"
+                f"committer C <c@example.com> {timestamp} +0000\n"
+                f"data {len(message)}\n".encode("utf-8") + message + f"\n{files}\n".encode("utf-8")
+            )
+            if i % self.tag_every == 0:
+                version = next(versions)
+                if (i // self.tag_every) % 2:
+                    stream.write(f"reset refs/tags/{version}\nfrom :{i}\n\n".encode("utf-8"))
+                else:
+                    stream.write(
+                        f"tag {version}\nfrom :{i}\n"
+                        f"tagger T <t@example.com> {timestamp} +0000\ndata 7\nrelease\n".encode(
+                            "utf-8"
+                        )
+                    )
+
+    def message(self, rnd: random.Random, i: int) -> str:
+        footers = {name for name in FOOTERS if rnd.random() < self.footer_mix.get(name, 0)}
+        commit_type = "revert" if "revert" in footers else rnd.choice(COMMIT_TYPES)
+        breaking = "!" if "breaking" in footers else ""
+        scope = f"(scope{rnd.randrange(20)})" if rnd.random() < 0.5 else ""
+        lines = [f"{commit_type}{scope}{breaking}: change {i}"]
+        if footers:
+            # The default config only accepts a body that a footer follows.
+            if self.body_lines:
+                lines.append("")
+                lines.extend(f"body line {n} of commit {i}" for n in range(self.body_lines))
+            lines.append("")
+        if "breaking" in footers:
+            lines.append(f"BREAKING CHANGE: api {i} removed")
+        if "closes" in footers:
+            lines.append(f"Closes: #{i}")
+        if "revert" in footers:
+            lines.append(f"Revert Hash: {rnd.getrandbits(160):040x}")
+        return "\n".join(lines) + "\n"
+
+
+def build_repository(spec: RepositorySpec, work_dir: Path) -> Path:
+    path = Path(f"{work_dir}/{spec.name}")
+    if Path(f"{path}/.cz/config.py").exists():
+        return path
+    shutil.rmtree(path, ignore_errors=True)
+    subprocess.run(["git", "init", "-q", "-b", "main", f"{path}"], check=True)
+    fast_import = ["git", "fast-import", "--quiet"]
+    with subprocess.Popen(fast_import, stdin=subprocess.PIPE, cwd=path) as process:
+        assert process.stdin is not None
+        spec.write_stream(process.stdin)
+        process.stdin.close()
+    if process.returncode != 0:
+        raise RuntimeError(f"git fast-import failed for {spec.name}")
+    subprocess.run(["git", "checkout", "-q", "main"], cwd=path, check=True)
+    Path(f"{path}/.cz").mkdir()
+    shutil.copy(f"{ROOT}/cz/templates/CHANGELOG.j2", f"{path}/.cz/CHANGELOG.j2")
+    # Written last, so an interrupted build is started again from scratch.
+    config = Path(f"{ROOT}/.cz/config.py").read_text()
+    Path(f"{path}/.cz/config.py").write_text(f"{config}\nconfig.set_cache_enabled(False)\n")
+    return path
+
+
+def case_get_tags(config: CommitizenConfig) -> Callable[[], Any]:
+    from cz.api.cc import ConventionalCommitsAPI
+
+    return lambda: ConventionalCommitsAPI(config).get_tags()
+
+
+def case_get_commits(config: CommitizenConfig) -> Callable[[], Any]:
+    from cz.api.cc import ConventionalCommitsAPI
+
+    def run() -> Any:
+        cc = ConventionalCommitsAPI(config)
+        cc.get_tags()
+        return cc.get_commits(is_version=True)
+
+    return run
+
+
+def case_parse(config: CommitizenConfig) -> Callable[[], Any]:
+    from cz.api.cc import ConventionalCommitsAPI
+
+    # Only the parser is measured; the messages are read from git beforehand.
+    git = ConventionalCommitsAPI(config)._git
+    messages = [commit_infos[8] for commit_infos in git.log("HEAD")]
+    parser = config.message_parser
+    return lambda: [parser.parse(message) for message in messages]
+
+
+def case_generate_changelog(config: CommitizenConfig) -> Callable[[], Any]:
+    from cz.api.cz import CommitizenAPI
+
+    return lambda: CommitizenAPI(config).generate_changelog()
+
+
+def case_bump_version(config: CommitizenConfig) -> Callable[[], Any]:
+    from cz.api.cz import CommitizenAPI
+
+    version_files = [
+        Path(f"{config.repository_path}/pyproject.toml"),
+        Path(f"{config.repository_path}/demo/__version__.py"),
+    ]
+    contents = [path.read_bytes() for path in version_files]
+
+    def run() -> Any:
+        try:
+            return CommitizenAPI(config).bump_version(is_commit=False)
+        finally:
+            for path, content in zip(version_files, contents):
+                path.write_bytes(content)
+
+    return run
+
+
+CASES: dict[str, Callable[[CommitizenConfig], Callable[[], Any]]] = {
+    "get_tags": case_get_tags,
+    "get_commits": case_get_commits,
+    "parse": case_parse,
+    "generate_changelog": case_generate_changelog,
+    "bump_version": case_bump_version,
+}
+
+
+def run_case(case: str, repository_path: Path, traced: bool) -> dict[str, Any]:
+    from cz.config import CommitizenConfig
+
+    run = CASES[case](CommitizenConfig.load(repository_path))
+    if traced:
+        tracemalloc.start()
+    start = time.perf_counter()
+    run()
+    elapsed = (time.perf_counter() - start) * 1000
+    peak = tracemalloc.get_traced_memory()[1] if traced else 0
+    return {"wall_ms": elapsed, "traced_peak_mib": peak / 2**20}
+
+
+def measure_in_child(cmd: list[str], cwd: Path) -> tuple[float, dict[str, Any], float]:
+    env = dict(os.environ, PYTHONPATH=f"{ROOT}")
+    start = time.perf_counter()
+    with subprocess.Popen(cmd, cwd=cwd, env=env, stdout=subprocess.PIPE) as process:
+        assert process.stdout is not None
+        output = process.stdout.read()
+        # wait4 gives the resource usage of this child alone.
+        _, status, rusage = os.wait4(process.pid, 0)
+        process.returncode = os.waitstatus_to_exitcode(status)
+    elapsed = (time.perf_counter() - start) * 1000
+    if process.returncode != 0:
+        raise RuntimeError(f"{cmd} exited with {process.returncode}")
+    result = json.loads(output) if output.strip().startswith(b"{") else {}
+    # ru_maxrss is in KiB on Linux
+    return elapsed, result, rusage.ru_maxrss / 1024
+
+
+def benchmark(repository_path: Path, runs: int) -> list[dict[str, Any]]:
+    results: list[dict[str, Any]] = []
+    script = [sys.executable, f"{Path(__file__).resolve()}", "--run-case"]
+    for case in CASES:
+        cmd = script + [case, f"--repository-path={repository_path}"]
+        timings = [measure_in_child(cmd, repository_path)[1]["wall_ms"] for _ in range(runs)]
+        _, traced, max_rss = measure_in_child(cmd + ["--traced"], repository_path)
+        results.append(_result(case, timings, traced["traced_peak_mib"], max_rss))
+    # The whole command, interpreter and imports included.
+    for case, args in {
+        "cz --version": ["--version"],
+        "cz changelog --stdout": ["changelog", "--stdout"],
+    }.items():
+        cmd = [sys.executable, "-m", "cz"] + args
+        measured = [measure_in_child(cmd, repository_path) for _ in range(runs)]
+        timings = [elapsed for elapsed, _, _ in measured]
+        results.append(_result(case, timings, None, max(rss for _, _, rss in measured)))
+    return results
+
+
+def _result(
+    case: str, timings: list[float], traced_peak: float | None, max_rss: float
+) -> dict[str, Any]:
+    return {
+        "case": case,
+        "best_ms": min(timings),
+        "median_ms": statistics.median(timings),
+        "traced_peak_mib": traced_peak,
+        "max_rss_mib": max_rss,
+    }
+
+
+def parse_footer_mix(text: str) -> dict[str, float]:
+    mix: dict[str, float] = {}
+    for item in filter(None, text.split(",")):
+        name, _, ratio = item.partition("=")
+        if name not in FOOTERS:
+            raise ValueError(f"Unknown footer: {name} (choose from {', '.join(FOOTERS)})")
+        mix[name] = float(ratio)
+    return mix
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--commits", default="1000,10000")
+    parser.add_argument("--tag-every", type=int, default=100)
+    parser.add_argument("--body-lines", type=int, default=2)
+    parser.add_argument("--footer-mix", default="closes=0.2,breaking=0.01,revert=0.005")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--work-dir", default=f"{tempfile.gettempdir()}/cz-benchmarks")
+    parser.add_argument("--json", action="store_true", help="print the results as JSON")
+    parser.add_argument("--run-case", help=argparse.SUPPRESS)
+    parser.add_argument("--repository-path", help=argparse.SUPPRESS)
+    parser.add_argument("--traced", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_case:
+        result = run_case(args.run_case, Path(args.repository_path), args.traced)
+        print(json.dumps(result))
+        return 0
+
+    work_dir = Path(args.work_dir)
+    work_dir.mkdir(parents=True, exist_ok=True)
+    footer_mix = parse_footer_mix(args.footer_mix)
+    report: list[dict[str, Any]] = []
+    for commits in [int(count) for count in args.commits.split(",")]:
+        spec = RepositorySpec(commits, args.tag_every, args.body_lines, footer_mix)
+        start = time.perf_counter()
+        repository_path = build_repository(spec, work_dir)
+        built = time.perf_counter() - start
+        results = benchmark(repository_path, args.runs)
+        report.append({"repository": spec.name, "results": results})
+        if args.json:
+            continue
+        print(f"\n{spec.name} ({len(spec.versions())} tags, ready in {built:.1f}s)")
+        print(f"{'case':<24}{'best':>10}{'median':>10}{'traced':>10}{'max rss':>10}")
+        for result in results:
+            traced = result["traced_peak_mib"]
+            print(
+                f"{result['case']:<24}{result['best_ms']:>10.1f}{result['median_ms']:>10.1f}"
+                f"{'-' if traced is None else f'{traced:.1f}':>10}"
+                f"{result['max_rss_mib']:>10.1f}"
+            )
+    if args.json:
+        print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,58 @@
+# Wall-clock startup time of the cz entry points:
+#
+#     python benchmarks/startup.py [--runs 10] [--repository-path .]
+#
+# Each command runs in a fresh interpreter; the best and the median are reported in ms.
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def measure(cmd: list[str], runs: int, cwd: Path) -> list[float]:
+    env = dict(os.environ, PYTHONPATH=f"{ROOT}")
+    timings: list[float] = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(cmd, cwd=cwd, env=env, check=True, capture_output=True)
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--repository-path", default=f"{ROOT}")
+    args = parser.parse_args()
+    repository_path = Path(args.repository_path).resolve()
+
+    with tempfile.TemporaryDirectory() as directory:
+        message_file = Path(f"{directory}/COMMIT_EDITMSG")
+        message_file.write_text("feat: measure startup\n")
+        socket_path = f"{directory}/missing.sock"  # no server, so cz-lint lints in process
+        python = [sys.executable]
+        cases = {
+            "python -c pass": python + ["-c", "pass"],
+            "cz --version": python + ["-m", "cz", "--version"],
+            "cz lint --commit-msg-file": python
+            + ["-m", "cz", "lint", f"--commit-msg-file={message_file}"],
+            "cz-lint (no server)": python
+            + ["-m", "cz.lint_client", f"--socket={socket_path}", f"{message_file}"],
+        }
+        print(f"{'command':<28}{'best':>10}{'median':>10}")
+        for name, cmd in cases.items():
+            timings = measure(cmd, args.runs, repository_path)
+            print(f"{name:<28}{min(timings):>10.1f}{statistics.median(timings):>10.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,179 +1,491 @@
 from __future__ import annotations
 
 import re
-import subprocess
+from collections import deque
+from pathlib import Path
 from typing import TYPE_CHECKING
+from typing import Iterator
 from typing import Optional
 
-from semver.version import Version
-
+from cz.cache import CommitCache
 from cz.config import CommitizenConfig
 from cz.conventional_commits.commit import ConventionalCommit
 from cz.conventional_commits.commit import Hash
 from cz.conventional_commits.commit_group import CommitGroup
+from cz.conventional_commits.history import CommitHistory
+from cz.conventional_commits.lint_error import LintError
+from cz.conventional_commits.message.codec import MessageCodec
+from cz.conventional_commits.message.message import Message
 from cz.conventional_commits.message.parser import MessageParser
 from cz.conventional_commits.tag import AnnotatedTag
 from cz.conventional_commits.tag import Tag
 from cz.conventional_commits.user import User
 from cz.conventional_commits.version_group import VersionGroup
+from cz.exceptions import InvalidCommitMessageError
 from cz.exceptions import InvalidVersionError
+from cz.git import BaseGitBackend
+from cz.git.runner import GitRunner
 from cz.global_variables import GlobalVariables
+from cz.profiling import profiler
 
 if TYPE_CHECKING:
+    from concurrent.futures import Future
+
+    from cz.conventional_commits.commit_type import CommitType
     from cz.defaults import BreakingChangeFooter
 
 
 class ConventionalCommitsAPI:
+    LINT_BATCH_SIZE = 500
+
     def __init__(
-        self, config: CommitizenConfig, global_variables: Optional[GlobalVariables] = None
+        self,
+        config: CommitizenConfig,
+        global_variables: Optional[GlobalVariables] = None,
+        runner: Optional[GitRunner] = None,
     ) -> None:
         self.global_variables = global_variables or GlobalVariables()
         self._config = config
+        self._runner = runner or config.git_runner_class(config.repository_path)
+        self._git = BaseGitBackend.create(config, self._runner)
 
+    @profiler.traced("get_commits")
     def get_commits(
         self,
         start: Optional[str] = None,
         end: str = "HEAD",
         is_version: bool = False,
+        unreleased_version: Optional[str] = None,
+        jobs: int = 1,
+        strict: bool = True,
     ) -> dict[str, ConventionalCommit]:
-        message_parser = MessageParser(
-            self._config.commit_types, self._config.footer_classes
-        )
         self.global_variables.commits = {}
-        separator = "@@__CZ__@@"
-        delimiter = "@@__CZ_DELIMITER__@@"
-        fotmat = [
-            # hash
-            "%H",  # commit hash
-            "%h",  # abbreviated commit hash
-            # author
-            "%an",  # author name
-            "%ae",  # author email
-            "%at",  # author date, UNIX timestamp
-            # committer
-            "%cn",  # committer name
-            "%ce",  # committer email
-            "%ct",  # committer date, UNIX timestamp
-            # subject and body
-            "%B",  # raw body (unwrapped subject and body)
-            # refs (only tag)
-            "%D",
-        ]
-        revision_range = f"{start}..{end}" if start else end
-        git_log_cmd = [
-            "git",
-            "--no-pager",
-            "log",
-            "--decorate=short",
-            "--decorate-refs=tags",
-            f"--pretty={delimiter.join(fotmat)}{separator}",
-            revision_range,
-        ]
-        completed_cmd = subprocess.run(
-            git_log_cmd, capture_output=True, check=True, cwd=self._config.repository_path
-        )
-        commit_strings = completed_cmd.stdout.decode("utf-8").split(f"{separator}\n")
-        commit_strings.pop()
+        if is_version and jobs > 1:
+            records = self._iter_commits_parallel(start, end, jobs, strict)
+        else:
+            records = self._iter_commits(f"{start}..{end}" if start else end, strict)
+        self.global_variables.unreleased_commits = {}
+        create_commit = profiler.wrap("create_commit", self._create_commit)
+        add_to_version_group = profiler.wrap("group", self._add_to_version_group)
         now_version: Optional[VersionGroup] = None
-        for commit_string in commit_strings:
-            commit_infos = commit_string.split(delimiter)
-            commit_hash = Hash(commit_infos[0], commit_infos[1])
-            author = User(
-                name=commit_infos[2],
-                email=commit_infos[3],
-                unix_time=int(commit_infos[4]),
-            )
-            committer = User(
-                name=commit_infos[5],
-                email=commit_infos[6],
-                unix_time=int(commit_infos[7]),
-            )
-            message = message_parser.parse(commit_infos[8])
-
-            commit_tags = self._parse_tags(commit_infos[9])
-            commit = ConventionalCommit(
-                commit_hash, author, committer, message, commit_tags
-            )
-            self.global_variables.commits[commit_hash.long] = commit
+        for commit_infos, message in records:
+            commit = create_commit(commit_infos, message)
+            self.global_variables.commits[commit_infos[0]] = commit
             if is_version:
-                version_tag: Optional[Tag] = self._get_only_one_version(commit_tags)
+                version_tag = self._get_only_one_version(commit_infos[0])
+                if not version_tag and not now_version and unreleased_version:
+                    version_tag = Tag(unreleased_version, commit_infos[0], commit.committer)
                 if version_tag:
-                    commit_groups: dict[str, CommitGroup] = {}
-                    for commit_type, title in self._config.titles.items():
-                        commit_groups[commit_type.name] = CommitGroup(commit_type, title)
-
-                    now_version = self.global_variables.version_groups.setdefault(
-                        version_tag, VersionGroup(version_tag, commit_groups)
-                    )
+                    now_version = self._open_version_group(self.global_variables, version_tag)
                 if now_version:
-                    commit_group = now_version.commit_groups.get(message.commit_type.name)
-                    if commit_group:
-                        commit_group.commits.append(commit)
-                        footer: Optional[BreakingChangeFooter] = message.footer.get(
-                            "BREAKING CHANGE"
-                        )
-                        if footer:
-                            now_version.notes.append(footer.body)
+                    add_to_version_group(now_version, commit, message)
+                else:
+                    self.global_variables.unreleased_commits[commit_infos[0]] = commit
+
         if is_version:
-            version_groups_list = list(self.global_variables.version_groups.values())
-            for i, version_group in enumerate(version_groups_list):
-                if i != 0:
-                    version_group.next = version_groups_list[i - 1]
-                if i != len(version_groups_list) - 1:
-                    version_group.previous = version_groups_list[i + 1]
-                for (
-                    commit_type_name,
-                    commit_group,
-                ) in version_group.commit_groups.copy().items():
-                    if not commit_group.commits:
-                        del version_group.commit_groups[commit_type_name]
+            self._link_version_groups(self.global_variables)
         return self.global_variables.commits.copy()
 
-    def _get_only_one_version(self, tags: dict[str, Tag]) -> Optional[Tag]:
-        version_tags: list[Tag] = []
+    @profiler.traced("get_package_commits")
+    def get_package_commits(
+        self,
+        start: Optional[str] = None,
+        end: str = "HEAD",
+        unreleased_version: Optional[str] = None,
+        strict: bool = True,
+    ) -> dict[str, GlobalVariables]:
+        # One walk of the history serves every package. A commit goes to the packages whose
+        # paths it changes, and each package's own tags open its version groups.
+        packages = self._config.packages
+        package_variables = {name: GlobalVariables() for name in packages}
+        tagged_packages: dict[str, set[str]] = {}
+        for tag in self.get_tags().values():
+            for name, package in packages.items():
+                if package.parse_tag(tag.name) is not None:
+                    variables = package_variables[name]
+                    variables.tags[tag.name] = tag
+                    variables.version_tags.setdefault(tag.commit_id, []).append(tag)
+                    tagged_packages.setdefault(tag.commit_id, set()).add(name)
+        package_paths: dict[str, list[str]] = {}
+        for name, package in packages.items():
+            package_paths.setdefault(package.path, []).append(name)
+        unreleased_tag_names: dict[str, str] = {}
+        if unreleased_version:
+            from semver.version import Version
+
+            for name, package in packages.items():
+                unreleased_tag_names[name] = (
+                    package.format_tag(Version.parse(unreleased_version))
+                    if Version.isvalid(unreleased_version)
+                    else unreleased_version
+                )
+        now_versions: dict[str, VersionGroup] = {}
+        revision_range = f"{start}..{end}" if start else end
+        parse = profiler.wrap("parse", self._config.message_parser.parse)
+        add_to_version_group = profiler.wrap("group", self._add_to_version_group)
+        commit_cache = CommitCache.open(self._config)
+        parsed = cached = 0
+        try:
+            for commit_infos, paths in self._git.log_paths(revision_range):
+                commit_hash = commit_infos[0]
+                for name in tagged_packages.get(commit_hash, ()):
+                    variables = package_variables[name]
+                    version_tag = self._get_only_one_version(commit_hash, variables)
+                    if version_tag:
+                        now_versions[name] = self._open_version_group(variables, version_tag)
+                names = _route_paths(paths, package_paths)
+                if not names:
+                    continue  # the message of a commit no package owns is not even parsed
+                message = commit_cache.get(commit_hash) if commit_cache else None
+                if message is None:
+                    message = parse(commit_infos[8], strict)
+                    parsed += 1
+                    if commit_cache:
+                        commit_cache.add(commit_hash, message)
+                else:
+                    cached += 1
+                commit = self._create_commit(commit_infos, message)
+                for name in names:
+                    variables = package_variables[name]
+                    variables.commits[commit_hash] = commit
+                    if name not in now_versions and unreleased_version:
+                        version_tag = Tag(unreleased_tag_names[name], commit_hash, commit.committer)
+                        now_versions[name] = self._open_version_group(variables, version_tag)
+                    if name in now_versions:
+                        add_to_version_group(now_versions[name], commit, message)
+                    else:
+                        variables.unreleased_commits[commit_hash] = commit
+        finally:
+            if commit_cache:
+                commit_cache.close()
+            profiler.count("commits.parsed", parsed)
+            profiler.count("commits.cached", cached)
+        for variables in package_variables.values():
+            self._link_version_groups(variables)
+        return package_variables
+
+    def _open_version_group(
+        self, global_variables: GlobalVariables, version_tag: Tag
+    ) -> VersionGroup:
+        commit_groups: dict[str, CommitGroup] = {}
+        for commit_type, title in self._config.titles.items():
+            commit_groups[commit_type.name] = CommitGroup(commit_type, title)
+        return global_variables.version_groups.setdefault(
+            version_tag, VersionGroup(version_tag, commit_groups)
+        )
+
+    def _add_to_version_group(
+        self, version_group: VersionGroup, commit: ConventionalCommit, message: Message
+    ) -> None:
+        commit_group = version_group.commit_groups.get(message.commit_type.name)
+        if commit_group:
+            commit_group.commits.append(commit)
+            footer: Optional[BreakingChangeFooter] = message.footer.get("BREAKING CHANGE")
+            if footer:
+                version_group.notes.append(footer.body)
+
+    def _link_version_groups(self, global_variables: GlobalVariables) -> None:
+        version_groups_list = list(global_variables.version_groups.values())
+        for i, version_group in enumerate(version_groups_list):
+            if i != 0:
+                version_group.next = version_groups_list[i - 1]
+            if i != len(version_groups_list) - 1:
+                version_group.previous = version_groups_list[i + 1]
+            for (
+                commit_type_name,
+                commit_group,
+            ) in version_group.commit_groups.copy().items():
+                if not commit_group.commits:
+                    del version_group.commit_groups[commit_type_name]
+
+    @profiler.traced("get_history")
+    def get_history(
+        self,
+        start: Optional[str] = None,
+        end: str = "HEAD",
+        unreleased_version: Optional[str] = None,
+        jobs: int = 1,
+    ) -> CommitHistory:
+        # Fills the columns straight from the log without building ConventionalCommit objects.
+        self.get_tags()
+        history = CommitHistory(list(self._config.commit_types))
+        if jobs > 1:
+            records = self._iter_commits_parallel(start, end, jobs, strict=False)
+        else:
+            records = self._iter_commits(f"{start}..{end}" if start else end, strict=False)
+        now_version: Optional[str] = None
+        for commit_infos, message in records:
+            version_tag = self._get_only_one_version(commit_infos[0])
+            if version_tag:
+                now_version = version_tag.name
+            elif not now_version and unreleased_version:
+                now_version = unreleased_version
+            history.append(
+                commit_infos[0],
+                int(commit_infos[4]),
+                int(commit_infos[7]),
+                message.commit_type.name,
+                message.scope,
+                message.is_breaking,
+                now_version,
+            )
+        return history
+
+    def iter_lint_errors(
+        self, start: Optional[str] = None, end: str = "HEAD", jobs: int = 1
+    ) -> Iterator[LintError]:
+        revision_range = f"{start}..{end}" if start else end
+        if jobs > 1:
+            yield from self._iter_lint_errors_parallel(revision_range, jobs)
+            return
+        message_parser = self._config.message_parser
+        lint_message = profiler.wrap("parse", _lint_message)
+        for commit_infos in self._git.log(revision_range):
+            error = lint_message(message_parser, commit_infos[0], commit_infos[8])
+            if error:
+                yield error
+
+    def _iter_lint_errors_parallel(self, revision_range: str, jobs: int) -> Iterator[LintError]:
+        from concurrent.futures import ProcessPoolExecutor
+
+        # The log is read here and validated in batches. Only a few batches per worker are
+        # queued, so a caller that stops early does not wait for the whole range.
+        with ProcessPoolExecutor(
+            jobs,
+            initializer=_init_worker,
+            initargs=(f"{self._config.repository_path}",),
+        ) as executor:
+            pending: deque[Future[list[LintError]]] = deque()
+            try:
+                batch: list[tuple[str, str]] = []
+                for commit_infos in self._git.log(revision_range):
+                    batch.append((commit_infos[0], commit_infos[8]))
+                    if len(batch) >= self.LINT_BATCH_SIZE:
+                        pending.append(executor.submit(_lint_batch, batch))
+                        batch = []
+                        while len(pending) > jobs * 2:
+                            yield from pending.popleft().result()
+                if batch:
+                    pending.append(executor.submit(_lint_batch, batch))
+                while pending:
+                    yield from pending.popleft().result()
+            finally:
+                for future in pending:
+                    future.cancel()
+
+    @profiler.traced("get_bump_types")
+    def get_bump_types(
+        self, start: Optional[str] = None, end: str = "HEAD"
+    ) -> tuple[list[tuple[CommitType, bool]], list[str]]:
+        # The increment depends only on the type and "!" of each commit, and a breaking
+        # change footer is rejected without "!", so only the subjects are read, up to the
+        # first breaking change. Returns the types and the version tags in the range, which
+        # get_tags must have collected.
+        message_parser = self._config.message_parser
+        revision_range = f"{start}..{end}" if start else end
+        bump_types: list[tuple[CommitType, bool]] = []
+        version_tag_names: list[str] = []
+        for commit_hash, subject in self._git.log_subjects(revision_range):
+            version_tag = self._get_only_one_version(commit_hash)
+            if version_tag:
+                version_tag_names.append(version_tag.name)
+            first_line = message_parser.parse_1st_line([subject])
+            is_breaking = bool(first_line["breaking"])
+            bump_types.append((message_parser.COMMIT_TYPES[first_line["type"]], is_breaking))
+            if is_breaking:
+                break
+        profiler.count("commits.scanned", len(bump_types))
+        if not bump_types or not bump_types[-1][1]:
+            return bump_types, version_tag_names
+        # The older commits may still carry version tags; listing their hashes is cheaper
+        # than reading their subjects, and unneeded without other version tags.
+        other_version_tags = [
+            tag
+            for tags in self.global_variables.version_tags.values()
+            for tag in tags
+            if tag.name != start
+        ]
+        if other_version_tags:
+            version_tag_names = []
+            for commit_hash in self._git.rev_list(revision_range):
+                version_tag = self._get_only_one_version(commit_hash)
+                if version_tag:
+                    version_tag_names.append(version_tag.name)
+        return bump_types, version_tag_names
+
+    @profiler.traced("get_package_bump_types")
+    def get_package_bump_types(
+        self, starts: dict[str, Optional[str]], end: str = "HEAD"
+    ) -> dict[str, tuple[list[tuple[CommitType, bool]], list[str]]]:
+        # get_bump_types of every package in one walk. starts maps each package to the tag of
+        # its current version, or None for one never released. The walk starts at the oldest
+        # of these tags and each package stops at its own, so only the subjects of the
+        # unreleased commits a package owns are parsed. Returns the types and the package's
+        # other tags found before its own, which get_tags must have collected.
+        packages = self._config.packages
+        tags = self.global_variables.tags
+        package_tags: dict[str, list[tuple[str, str]]] = {}
         for tag in tags.values():
-            if Version.isvalid(tag.name):
-                version_tags.append(tag)
+            for name, package in packages.items():
+                if package.parse_tag(tag.name) is not None:
+                    package_tags.setdefault(tag.commit_id, []).append((name, tag.name))
+        package_paths: dict[str, list[str]] = {}
+        for name, package in packages.items():
+            package_paths.setdefault(package.path, []).append(name)
+        start_tags = [tags[tag_name] for tag_name in starts.values() if tag_name]
+        start: Optional[str] = None
+        if start_tags and len(start_tags) == len(starts):
+            start = min(start_tags, key=lambda tag: tag.creator.unix_time).name
+        results: dict[str, tuple[list[tuple[CommitType, bool]], list[str]]] = {
+            name: ([], []) for name in packages
+        }
+        collecting = set(packages)
+        message_parser = self._config.message_parser
+        scanned = 0
+        for commit_infos, paths in self._git.log_paths(f"{start}..{end}" if start else end):
+            for name, tag_name in package_tags.get(commit_infos[0], ()):
+                if name not in collecting:
+                    continue
+                if tag_name == starts.get(name):
+                    collecting.discard(name)
+                else:
+                    results[name][1].append(tag_name)
+            if not collecting:
+                break
+            names = _route_paths(paths, package_paths) & collecting
+            if not names:
+                continue
+            first_line = message_parser.parse_1st_line([commit_infos[8].partition("\n")[0]])
+            bump_type = (
+                message_parser.COMMIT_TYPES[first_line["type"]],
+                bool(first_line["breaking"]),
+            )
+            scanned += 1
+            for name in names:
+                results[name][0].append(bump_type)
+        profiler.count("commits.scanned", scanned)
+        return results
+
+    def get_commit(self, rev: str, strict: bool = True) -> ConventionalCommit:
+        commit_infos = self._git.read_commit(rev)
+        if commit_infos is None:
+            raise ValueError(f"unknown revision: {rev}")
+        message = self._config.message_parser.parse(commit_infos[8], strict)
+        return self._create_commit(commit_infos, message)
+
+    def _create_commit(self, commit_infos: list[str], message: Message) -> ConventionalCommit:
+        commit_hash = Hash(commit_infos[0], commit_infos[1])
+        author = User(
+            name=commit_infos[2],
+            email=commit_infos[3],
+            unix_time=int(commit_infos[4]),
+        )
+        committer = User(
+            name=commit_infos[5],
+            email=commit_infos[6],
+            unix_time=int(commit_infos[7]),
+        )
+        commit_tags = self.global_variables.commit_tags.get(commit_infos[0], {})
+        return ConventionalCommit(commit_hash, author, committer, message, commit_tags)
+
+    def _iter_commits(
+        self, revision_range: str, strict: bool = True
+    ) -> Iterator[tuple[list[str], Message]]:
+        parse = profiler.wrap("parse", self._config.message_parser.parse)
+        commit_cache = CommitCache.open(self._config)
+        parsed = cached = 0
+        try:
+            for commit_infos in self._git.log(revision_range):
+                message = commit_cache.get(commit_infos[0]) if commit_cache else None
+                if message is None:
+                    message = parse(commit_infos[8], strict)
+                    parsed += 1
+                    if commit_cache:
+                        commit_cache.add(commit_infos[0], message)
+                else:
+                    cached += 1
+                yield commit_infos, message
+        finally:
+            if commit_cache:
+                commit_cache.close()
+            profiler.count("commits.parsed", parsed)
+            profiler.count("commits.cached", cached)
+
+    def _iter_commits_parallel(
+        self, start: Optional[str], end: str, jobs: int, strict: bool = True
+    ) -> Iterator[tuple[list[str], Message]]:
+        from concurrent.futures import ProcessPoolExecutor
+
+        revision_ranges = self._split_revision_range(start, end)
+        if revision_ranges is None:
+            yield from self._iter_commits(f"{start}..{end}" if start else end, strict)
+            return
+        message_parser = self._config.message_parser
+        codec = MessageCodec(self._config.commit_types, self._config.footer_classes)
+        with ProcessPoolExecutor(
+            jobs,
+            initializer=_init_worker,
+            initargs=(f"{self._config.repository_path}",),
+        ) as executor:
+            # map keeps the order of the ranges, so commits still arrive newest first.
+            for records in executor.map(
+                _parse_revision_range, revision_ranges, [strict] * len(revision_ranges)
+            ):
+                for commit_infos, data in records:
+                    if data is None:
+                        message = message_parser.parse(commit_infos[8], strict)
+                    else:
+                        message = codec.decode(data)
+                    yield commit_infos, message
+
+    def _split_revision_range(self, start: Optional[str], end: str) -> Optional[list[str]]:
+        # The log is cut at the version tags in the order it lists them. Each piece has to log
+        # exactly its slice of the whole log, otherwise None tells the caller to walk serially.
+        revision_range = f"{start}..{end}" if start else end
+        commit_hashes = list(self._git.rev_list(revision_range))
+        if not commit_hashes:
+            return []
+        bounds = [
+            i
+            for i, commit_hash in enumerate(commit_hashes)
+            if i and commit_hash in self.global_variables.version_tags
+        ]
+        revision_ranges: list[str] = []
+        for first, last in zip([0] + bounds, bounds + [len(commit_hashes)]):
+            if last < len(commit_hashes):
+                revision_ranges.append(f"{commit_hashes[last]}..{commit_hashes[first]}")
+            elif start:
+                revision_ranges.append(f"{start}..{commit_hashes[first]}")
+            else:
+                revision_ranges.append(commit_hashes[first])
+            if list(self._git.rev_list(revision_ranges[-1])) != commit_hashes[first:last]:
+                return None
+        return revision_ranges
 
-        if len(version_tags) == 0:
+    def _get_only_one_version(
+        self, commit_hash: str, global_variables: Optional[GlobalVariables] = None
+    ) -> Optional[Tag]:
+        global_variables = global_variables or self.global_variables
+        version_tags = global_variables.version_tags.get(commit_hash)
+        if not version_tags:
             return None
         if len(version_tags) == 1:
             return version_tags[0]
         raise InvalidVersionError("A commit cannot contain multiple version tags.")
 
-    def _parse_tags(self, tags_line: str) -> dict[str, Tag]:
-        result: dict[str, Tag] = {}
-        if tags_line != "":
-            for tag_string in tags_line.split(","):
-                name = tag_string.strip("tag: ")
-                result[name] = self.global_variables.tags[name]
-        return result
-
+    @profiler.traced("get_tags")
     def get_tags(self) -> dict[str, Tag]:
+        from semver.version import Version
+
         self.global_variables.tags = {}
+        self.global_variables.commit_tags = {}
+        self.global_variables.version_tags = {}
         CREATOR_REGEX = re.compile(
             r"(?P<creator_name>.+) <(?P<creator_email>.+)> (?P<unix_time>\d+) (?P<timezone>.+)"
         )
-        separator = "\n"
-        delimiter = "\t"
-        fotmat = ["%(objecttype)", "%(objectname)", "%(refname:short)", "%(creator)"]
-        git_for_each_ref_cmd = [
-            "git",
-            "for-each-ref",
-            "--sort=-creatordate",
-            f"--format={delimiter.join(fotmat)}",
-            "refs/tags",
-        ]
-        completed_cmd = subprocess.run(
-            git_for_each_ref_cmd,
-            capture_output=True,
-            check=True,
-            cwd=self._config.repository_path,
-        )
-        tag_strings = completed_cmd.stdout.decode("utf-8").split(separator)
-        tag_strings.pop()
-        for tag_string in tag_strings:
-            object_type, commit_id, name, creator_string = tag_string.split(delimiter)
+        for tag_record in self._git.tags():
+            object_type, object_id, peeled_id, name, creator_string = tag_record
+            commit_id = peeled_id or object_id
             result = CREATOR_REGEX.match(creator_string)
             if not result:
                 raise RuntimeError(
@@ -182,5 +494,67 @@ class ConventionalCommitsAPI:
             creator_name, creator_email, unix_time, _ = result.groups()
             creator = User(creator_name, creator_email, int(unix_time))
             tag_class = AnnotatedTag if object_type == "tag" else Tag
-            self.global_variables.tags[name] = tag_class(name, commit_id, creator)
+            tag = tag_class(name, commit_id, creator)
+            self.global_variables.tags[name] = tag
+            self.global_variables.commit_tags.setdefault(commit_id, {})[name] = tag
+            if Version.isvalid(name):
+                self.global_variables.version_tags.setdefault(commit_id, []).append(tag)
+        profiler.count("tags", len(self.global_variables.tags))
         return self.global_variables.tags.copy()
+
+
+_worker_api: Optional[ConventionalCommitsAPI] = None
+
+
+def _init_worker(repository_path: str) -> None:
+    global _worker_api
+    _worker_api = ConventionalCommitsAPI(CommitizenConfig.load(Path(repository_path)))
+
+
+def _parse_revision_range(
+    revision_range: str, strict: bool = True
+) -> list[tuple[list[str], Optional[str]]]:
+    if _worker_api is None:
+        raise RuntimeError("The worker is not initialized.")
+    config = _worker_api._config
+    codec = MessageCodec(config.commit_types, config.footer_classes)
+    records: list[tuple[list[str], Optional[str]]] = []
+    for commit_infos, message in _worker_api._iter_commits(revision_range, strict):
+        data = codec.encode(message)
+        if data is not None:
+            # The parent only needs the raw message when it has to parse it itself.
+            commit_infos[8] = ""
+        records.append((commit_infos, data))
+    return records
+
+
+def _route_paths(paths: list[str], package_paths: dict[str, list[str]]) -> set[str]:
+    # Every directory above a path is looked up, so the cost does not grow with the number
+    # of packages.
+    names: set[str] = set(package_paths.get("", []))
+    for path in paths:
+        directory = path
+        while directory:
+            names.update(package_paths.get(directory, []))
+            directory = directory.rpartition("/")[0]
+    return names
+
+
+def _lint_batch(batch: list[tuple[str, str]]) -> list[LintError]:
+    if _worker_api is None:
+        raise RuntimeError("The worker is not initialized.")
+    message_parser = _worker_api._config.message_parser
+    errors: list[LintError] = []
+    for commit_hash, raw in batch:
+        error = _lint_message(message_parser, commit_hash, raw)
+        if error:
+            errors.append(error)
+    return errors
+
+
+def _lint_message(message_parser: MessageParser, commit_hash: str, raw: str) -> Optional[LintError]:
+    try:
+        message_parser.parse(raw)
+    except InvalidCommitMessageError as e:
+        return LintError(commit_hash, e.rule, e.line, f"{e}")
+    return None
@@ -1,30 +1,58 @@
 # pyright: reportUnknownMemberType=false
+from __future__ import annotations
+
+import re
+from collections import deque
+from itertools import islice
 from pathlib import Path
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import Iterator
 from typing import Optional
+from typing import Union
 
-import mdformat
-from semver.version import Version
-
+from cz.cache import SectionCache
 from cz.config import CommitizenConfig
-from cz.conventional_commits.commit import ConventionalCommit
-from cz.conventional_commits.message.parser import MessageParser
+from cz.conventional_commits.lint_error import LintError
+from cz.conventional_commits.tag import Tag
+from cz.conventional_commits.version_group import VersionGroup
 from cz.global_variables import GlobalVariables
+from cz.package import Package
+from cz.profiling import profiler
 from cz.versioning import VersionAttributes
 from cz.versioning.files import VersionFiles
 
 from .cc import ConventionalCommitsAPI
 from .git import GitAPI
 
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+    from concurrent.futures import Future
+
+    from jinja2 import Template
+    from semver.version import Version
+
+    from cz.conventional_commits.commit_type import CommitType
+
 
 class CommitizenAPI:
+    HEADING_TOKEN_SEPARATOR_REGEX = re.compile(r"[\s\[\]()/]+")
+    # Templates defining these blocks are formatted per section; others as one document.
+    SECTION_BLOCKS = {"header", "version"}
+
     def __init__(
         self, config: CommitizenConfig, global_variables: Optional[GlobalVariables] = None
     ) -> None:
         self._config = config
         self.global_variables = global_variables or GlobalVariables()
-        self.cc = ConventionalCommitsAPI(self._config, self.global_variables)
-        self.git = GitAPI(config, self.global_variables)
+        self.runner = config.git_runner_class(config.repository_path)
+        self.cc = ConventionalCommitsAPI(self._config, self.global_variables, self.runner)
+        self.git = GitAPI(config, self.global_variables, self.runner)
 
+    def close(self) -> None:
+        self.runner.close()
+
+    @profiler.traced("bump_version")
     def bump_version(
         self, prerelease: Optional[str] = None, is_commit: bool = True
     ) -> tuple[Version, Optional[Version]]:
@@ -34,8 +62,7 @@ class CommitizenAPI:
         if prerelease:
             if (
                 current_version.prerelease
-                and prerelease
-                != current_version.prerelease[: current_version.prerelease.find(".")]
+                and prerelease != current_version.prerelease[: current_version.prerelease.find(".")]
             ):
                 current_version = current_version.finalize_version()
             next_version = current_version.bump_prerelease(prerelease)
@@ -45,9 +72,8 @@ class CommitizenAPI:
             current_version_string = f"{current_version}"
             tags = self.cc.get_tags()
             if current_version_string == "0.0.0":
-                commits = self.cc.get_commits(is_version=True)
-                if self.global_variables.version_groups:
-                    versions = [tag.name for tag in self.global_variables.version_groups]
+                bump_types, versions = self.cc.get_bump_types()
+                if versions:
                     raise RuntimeError(
                         f"""Unable to determine next version
         Commits from First Commit to HEAD are tagged with the version.
@@ -55,14 +81,9 @@ class CommitizenAPI:
                     )
             else:
                 if current_version_string not in tags:
-                    raise RuntimeError(
-                        f"The current version ({current_version}) is not tagged"
-                    )
-                commits = self.cc.get_commits(
-                    start=current_version_string, is_version=True
-                )
-                if self.global_variables.version_groups:
-                    versions = [tag.name for tag in self.global_variables.version_groups]
+                    raise RuntimeError(f"The current version ({current_version}) is not tagged")
+                bump_types, versions = self.cc.get_bump_types(start=current_version_string)
+                if versions:
                     raise RuntimeError(
                         f"""Unable to determine next version
         Commits from {current_version} to "HEAD" have "version tagging" other than the current version.
@@ -70,36 +91,96 @@ class CommitizenAPI:
         Other Version: {versions}"""
                     )
 
-            next_version = self._increment_version(commits, current_version)
+            next_version = self._increment_version(bump_types, current_version)
 
         if next_version:
             version_files.set_version(next_version)
             if is_commit:
-                files: list[Path] = []
-                for version_file in version_files.version_files:
-                    if version_file.IS_COMMIT:
-                        files.append(version_file.get_path())
-                    pass
-                if files:
-                    self.git.add(files)
-                    self.git.commit(f"bump: version {current_version} → {next_version}")
-                    next_version_tag = self._config.format_tag_fn(next_version)
-                    self.git.tag(next_version_tag)
+                self._commit_version_files(
+                    version_files,
+                    f"bump: version {current_version} → {next_version}",
+                    self._config.format_tag_fn(next_version),
+                )
             return current_version, next_version
         return current_version, next_version
 
+    @profiler.traced("bump_packages")
+    def bump_packages(self, is_commit: bool = True) -> dict[str, tuple[Version, Optional[Version]]]:
+        # The next version of every package comes from one walk from the oldest current tag
+        # to HEAD; each package is then committed and tagged on its own.
+        tags = self.cc.get_tags()
+        package_version_files: dict[str, tuple[VersionFiles, Version]] = {}
+        starts: dict[str, Optional[str]] = {}
+        for name, package in self._config.packages.items():
+            version_files = VersionFiles(package.init_version_files_fn(self._config, package))
+            current_version = version_files.get_version()
+            package_version_files[name] = version_files, current_version
+            if f"{current_version}" == "0.0.0":
+                starts[name] = None
+            elif package.format_tag(current_version) in tags:
+                starts[name] = package.format_tag(current_version)
+            else:
+                raise RuntimeError(
+                    f"The current version of {name} ({current_version}) is not tagged"
+                )
+        package_bump_types = self.cc.get_package_bump_types(starts)
+        results: dict[str, tuple[Version, Optional[Version]]] = {}
+        for name, package in self._config.packages.items():
+            version_files, current_version = package_version_files[name]
+            bump_types, versions = package_bump_types[name]
+            if versions and starts[name] is None:
+                raise RuntimeError(
+                    f"Unable to determine the next version of {name}: "
+                    f"its history is already tagged with {versions}"
+                )
+            elif versions:
+                raise RuntimeError(
+                    f"The current version of {name} ({current_version}) is not its latest tag"
+                )
+            next_version = self._increment_version(bump_types, current_version)
+            if next_version:
+                version_files.set_version(next_version)
+                if is_commit:
+                    self._commit_version_files(
+                        version_files,
+                        f"bump: {name} version {current_version} → {next_version}",
+                        package.format_tag(next_version),
+                    )
+            results[name] = (current_version, next_version)
+        return results
+
+    def _commit_version_files(
+        self, version_files: VersionFiles, message: str, next_version_tag: str
+    ) -> None:
+        files: list[Path] = []
+        for version_file in version_files.version_files:
+            if version_file.IS_COMMIT:
+                files.append(version_file.get_path())
+        if not files:
+            return
+        if self._config.bump_backend == "plumbing":
+            try:
+                self.git.commit_and_tag(files, message, next_version_tag)
+            except BaseException:
+                version_files.rollback()
+                raise
+        else:
+            self.git.add(files)
+            self.git.commit(message)
+            self.git.tag(next_version_tag)
+
     def _increment_version(
-        self, commits: dict[str, ConventionalCommit], version: Version
+        self, bump_types: list[tuple[CommitType, bool]], version: Version
     ) -> Optional[Version]:
         bump_map = self._config.bump_map
         increment: Optional[VersionAttributes] = None
-        for commit in commits.values():
-            if commit.is_breaking:
+        for commit_type, is_breaking in bump_types:
+            if is_breaking:
                 increment = VersionAttributes.MAJOR
                 break
-            elif commit.type in bump_map:
+            elif commit_type in bump_map:
                 if increment != VersionAttributes.MINOR:
-                    increment = bump_map[commit.type]
+                    increment = bump_map[commit_type]
         if increment:
             return version.next_version(increment.value)
         return None
@@ -108,20 +189,192 @@ class CommitizenAPI:
         self,
         start: Optional[str] = None,
         end: str = "HEAD",
-    ) -> None:
-        self.cc.get_commits(start, end)
+        jobs: int = 1,
+        max_errors: int = 0,
+    ) -> Iterator[LintError]:
+        errors = self.cc.iter_lint_errors(start, end, jobs)
+        return islice(errors, max_errors) if max_errors > 0 else errors
+
+    def lint_commit(self, rev: str) -> None:
+        self.cc.get_commit(rev, strict=True)
 
     def lint_message(self, msg: str) -> None:
-        message_parser = MessageParser(
-            self._config.commit_types, self._config.footer_classes
-        )
-        message_parser.parse(msg)
+        self._config.message_parser.parse(msg)
 
-    def generate_changelog(self) -> str:
+    def generate_changelog(
+        self,
+        start_rev: Optional[str] = None,
+        unreleased_version: Optional[str] = None,
+        jobs: int = 1,
+    ) -> str:
+        return "".join(self.iter_changelog(start_rev, unreleased_version, jobs))
+
+    def update_changelog(
+        self, changelog: str, unreleased_version: Optional[str] = None, jobs: int = 1
+    ) -> str:
+        return "".join(self.iter_updated_changelog(changelog, unreleased_version, jobs))
+
+    def iter_changelog(
+        self,
+        start_rev: Optional[str] = None,
+        unreleased_version: Optional[str] = None,
+        jobs: int = 1,
+    ) -> Iterator[str]:
         self.cc.get_tags()
-        self.cc.get_commits(is_version=True)
-        changelog = self._config.changelog_template.render(
-            version_groups=self.global_variables.version_groups,
-            repository_url=self._config.repository_url,
+        self.cc.get_commits(
+            start=start_rev,
+            is_version=True,
+            unreleased_version=unreleased_version,
+            jobs=jobs,
+        )
+        return self._iter_render_changelog(
+            self._config.changelog_template, self.global_variables.version_groups, jobs
         )
-        return mdformat.text(changelog)
+
+    def iter_package_changelogs(
+        self, unreleased_version: Optional[str] = None, jobs: int = 1
+    ) -> Iterator[tuple[Package, Iterator[str]]]:
+        package_variables = self.cc.get_package_commits(unreleased_version=unreleased_version)
+        for name, package in self._config.packages.items():
+            template = self._config.changelog_template
+            if package.changelog_template_name:
+                template = self._config.get_changelog_template(package.changelog_template_name)
+            chunks = self._iter_render_changelog(
+                template, package_variables[name].version_groups, jobs, package
+            )
+            yield package, chunks
+
+    def iter_updated_changelog(
+        self, changelog: str, unreleased_version: Optional[str] = None, jobs: int = 1
+    ) -> Iterator[str]:
+        tags = self.cc.get_tags()
+        latest = self._find_latest_version(changelog, tags)
+        if latest is None:
+            return self.iter_changelog(unreleased_version=unreleased_version, jobs=jobs)
+        latest_tag, position = latest
+        self.cc.get_commits(
+            start=latest_tag.name,
+            is_version=True,
+            unreleased_version=unreleased_version,
+            jobs=jobs,
+        )
+        version_groups = list(self.global_variables.version_groups.values())
+        if version_groups:
+            version_groups[-1].previous = VersionGroup(latest_tag)
+        chunks = self._iter_render_changelog(
+            self._config.changelog_template, self.global_variables.version_groups, jobs
+        )
+        return self._append_tail(chunks, changelog[position:])
+
+    @staticmethod
+    def _append_tail(chunks: Iterator[str], tail: str) -> Iterator[str]:
+        # Only the last chunk is held back, to strip the whitespace before the tail.
+        previous = ""
+        for chunk in chunks:
+            if previous:
+                yield previous
+            previous = chunk
+        yield f"{previous.rstrip()}\n\n{tail}"
+
+    def _iter_render_changelog(
+        self,
+        template: Template,
+        version_groups: dict[Tag, VersionGroup],
+        jobs: int = 1,
+        package: Optional[Package] = None,
+    ) -> Iterator[str]:
+        variables = {
+            "version_groups": version_groups,
+            "repository_url": self._config.repository_url,
+            "package": package,
+        }
+        if not self.SECTION_BLOCKS <= template.blocks.keys():
+            import mdformat
+
+            with profiler.span("render"):
+                changelog = template.render(variables)
+            with profiler.span("format"):
+                changelog = mdformat.text(changelog)
+            yield changelog
+            return
+        # Each section is formatted on its own, so released versions come from the cache
+        # and a section is written as soon as it is formatted.
+        separator = ""
+        for section in self._format_sections(self._iter_sections(template, variables), jobs):
+            if section:
+                yield separator
+                yield section
+                separator = "\n"
+
+    def _iter_sections(self, template: Template, variables: dict[str, Any]) -> Iterator[str]:
+        with profiler.span("render"):
+            section = "".join(template.blocks["header"](template.new_context(variables)))
+        yield section
+        for version_group in variables["version_groups"].values():
+            with profiler.span("render"):
+                context = template.new_context({**variables, "version": version_group})
+                section = "".join(template.blocks["version"](context))
+            yield section
+
+    def _format_sections(self, sections: Iterator[str], jobs: int) -> Iterator[str]:
+        import mdformat
+
+        section_cache = SectionCache.open(self._config)
+        executor: Optional[Executor] = None
+        # Only a few sections per worker are queued ahead of the one being written.
+        pending: deque[tuple[str, Union[str, Future[str]]]] = deque()
+        try:
+            for section in sections:
+                formatted = section_cache.get(section) if section_cache else None
+                if formatted is not None:
+                    profiler.count("sections.cached")
+                    pending.append((section, formatted))
+                elif jobs > 1:
+                    if executor is None:
+                        from concurrent.futures import ProcessPoolExecutor
+
+                        executor = ProcessPoolExecutor(jobs)
+                    pending.append((section, executor.submit(mdformat.text, section)))
+                else:
+                    with profiler.span("format"):
+                        pending.append((section, mdformat.text(section)))
+                while len(pending) > jobs * 2:
+                    yield self._resolve_section(pending.popleft(), section_cache)
+            while pending:
+                yield self._resolve_section(pending.popleft(), section_cache)
+        finally:
+            for _, result in pending:
+                if not isinstance(result, str):
+                    result.cancel()
+            if executor:
+                executor.shutdown()
+            if section_cache:
+                section_cache.close()
+
+    @staticmethod
+    def _resolve_section(
+        item: tuple[str, Union[str, Future[str]]], section_cache: Optional[SectionCache]
+    ) -> str:
+        section, result = item
+        if isinstance(result, str):
+            formatted = result
+        else:
+            with profiler.span("format.wait"):
+                formatted = result.result()
+        if section_cache:
+            section_cache.add(section, formatted)
+        return formatted
+
+    def _find_latest_version(
+        self, changelog: str, tags: dict[str, Tag]
+    ) -> Optional[tuple[Tag, int]]:
+        from semver.version import Version
+
+        position = 0
+        for line in changelog.splitlines(keepends=True):
+            if line.startswith("#"):
+                for token in self.HEADING_TOKEN_SEPARATOR_REGEX.split(line):
+                    if token in tags and Version.isvalid(token):
+                        return tags[token], position
+            position += len(line)
+        return None
@@ -1,39 +1,104 @@
-import subprocess
 from pathlib import Path
 from typing import Optional
 
 from cz.config import CommitizenConfig
+from cz.git.runner import GitRunner
 from cz.global_variables import GlobalVariables
 
 
 class GitAPI:
     def __init__(
-        self, config: CommitizenConfig, global_variables: Optional[GlobalVariables] = None
+        self,
+        config: CommitizenConfig,
+        global_variables: Optional[GlobalVariables] = None,
+        runner: Optional[GitRunner] = None,
     ) -> None:
         self._config = config
         self.global_variables = global_variables or GlobalVariables()
+        self._runner = runner or config.git_runner_class(config.repository_path)
 
     def add(self, paths: list[Path]) -> None:
-        git_add_cmd = ["git", "add"] + [f"{path}" for path in paths]
-        subprocess.run(
-            git_add_cmd, capture_output=True, check=True, cwd=self._config.repository_path
-        )
+        git_add_cmd = ["add"] + [f"{path}" for path in paths]
+        self._runner.run(git_add_cmd)
 
     def commit(self, msg: str) -> None:
-        git_commit_cmd = ["git", "commit"]
+        git_commit_cmd = ["commit"]
         lines = msg.split("\n")
         for line in lines:
             git_commit_cmd.append("-m")
             git_commit_cmd.append(line)
-        subprocess.run(
-            git_commit_cmd,
-            capture_output=True,
-            check=True,
-            cwd=self._config.repository_path,
-        )
+        self._runner.run(git_commit_cmd)
 
     def tag(self, name: str) -> None:
-        git_tag_cmd = ["git", "tag", name]
-        subprocess.run(
-            git_tag_cmd, capture_output=True, check=True, cwd=self._config.repository_path
+        git_tag_cmd = ["tag", name]
+        self._runner.run(git_tag_cmd)
+
+    def commit_and_tag(self, paths: list[Path], msg: str, tag_name: str) -> None:
+        # Objects written before the ref transaction stay unreachable when a step fails,
+        # so the branch and the tag are either both updated or left as they were. On failure
+        # the caller puts the version files back.
+        head = self._resolve("HEAD^{commit}")
+        base_tree = self._resolve("HEAD^{tree}")
+        blobs = self._run(["hash-object", "-w", "--"] + [f"{path}" for path in paths]).split("\n")
+        # The config may live below the top of the work tree, which the tree paths start at.
+        root = Path(self._run(["rev-parse", "--show-toplevel"])).resolve()
+        changes: dict[tuple[str, ...], str] = {}
+        for path, blob in zip(paths, blobs):
+            changes[path.resolve().relative_to(root).parts] = blob
+        tree = self._write_tree(base_tree, changes)
+        # "git commit" ends the message with a newline, so the same bump makes the same commit.
+        commit = self._run(["commit-tree", tree, "-p", head, "-F", "-"], f"{msg}\n")
+        self._run(
+            ["update-ref", "-m", msg.split("\n")[0], "--stdin"],
+            f"start\n"
+            f"update HEAD {commit} {head}\n"
+            f"create refs/tags/{tag_name} {commit}\n"
+            "prepare\n"
+            "commit\n",
         )
+        try:
+            # "--add" like "git add", for a version file git does not track yet
+            self._run(["update-index", "--add", "--"] + [f"{path}" for path in paths])
+        except BaseException:
+            # The refs are moved back, so a failure leaves no commit or tag behind.
+            self._run(
+                ["update-ref", "--stdin"],
+                f"start\n"
+                f"update HEAD {head} {commit}\n"
+                f"delete refs/tags/{tag_name} {commit}\n"
+                "prepare\n"
+                "commit\n",
+            )
+            raise
+
+    def _write_tree(self, tree: Optional[str], changes: dict[tuple[str, ...], str]) -> str:
+        entries: dict[str, str] = {}
+        if tree:
+            # Without "--full-tree", ls-tree only lists what is below the current directory.
+            for entry in self._run(["ls-tree", "--full-tree", "-z", tree]).split("\0"):
+                if entry:
+                    info, name = entry.split("\t", 1)
+                    entries[name] = info
+        subtree_changes: dict[str, dict[tuple[str, ...], str]] = {}
+        for parts, blob in changes.items():
+            if len(parts) == 1:
+                mode = entries[parts[0]].split(" ")[0] if parts[0] in entries else "100644"
+                entries[parts[0]] = f"{mode} blob {blob}"
+            else:
+                subtree_changes.setdefault(parts[0], {})[parts[1:]] = blob
+        for name, nested_changes in subtree_changes.items():
+            base_subtree = entries[name].split(" ")[2] if name in entries else None
+            subtree = self._write_tree(base_subtree, nested_changes)
+            entries[name] = f"040000 tree {subtree}"
+        mktree_input = "".join(f"{info}\t{name}\0" for name, info in entries.items())
+        return self._run(["mktree", "-z"], mktree_input)
+
+    def _resolve(self, rev: str) -> str:
+        result = self._runner.batch_check(rev)
+        if result is None:
+            raise ValueError(f"unknown revision: {rev}")
+        return result[0]
+
+    def _run(self, args: list[str], input: Optional[str] = None) -> str:
+        output = self._runner.run(args, input.encode("utf-8") if input is not None else None)
+        return output.decode("utf-8").strip()
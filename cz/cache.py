@@ -0,0 +1,253 @@
+from __future__ import annotations
+
+import ast
+import hashlib
+import importlib.util
+import json
+import os
+import pickle
+import sqlite3
+import sys
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import Optional
+from typing import TypeVar
+
+from .__version__ import __version__
+from .conventional_commits.message.codec import MessageCodec
+from .conventional_commits.message.message import Message
+
+if TYPE_CHECKING:
+    from .config import CommitizenConfig
+
+CacheType = TypeVar("CacheType", bound="BaseCache")
+
+
+def prepare_cache_path(cache_path: Path) -> None:
+    cache_path.mkdir(parents=True, exist_ok=True)
+    gitignore = Path(f"{cache_path}/.gitignore")
+    if not gitignore.exists():
+        gitignore.write_text("*\n")
+
+
+class BaseCache:
+    FILE_NAME: str
+    SCHEMA = ""
+
+    @classmethod
+    def open(cls: type[CacheType], config: CommitizenConfig) -> Optional[CacheType]:
+        if not config.cache_enabled:
+            return None
+        try:
+            prepare_cache_path(config.cache_path)
+            connection = sqlite3.connect(f"{config.cache_path}/{cls.FILE_NAME}")
+            connection.executescript(
+                "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);" + cls.SCHEMA
+            )
+            return cls(config, connection)
+        except (OSError, sqlite3.Error):
+            # A read-only checkout must still work, just without the cache.
+            return None
+
+    def __init__(self, config: CommitizenConfig, connection: sqlite3.Connection) -> None:
+        self._config = config
+        self._connection = connection
+
+    def close(self) -> None:
+        try:
+            self._connection.commit()
+        except sqlite3.Error:
+            pass
+        finally:
+            self._connection.close()
+
+
+class CommitCache(BaseCache):
+    FILE_NAME = "commits.sqlite3"
+    SCHEMA = "CREATE TABLE IF NOT EXISTS commits (hash TEXT PRIMARY KEY, data TEXT);"
+
+    def __init__(self, config: CommitizenConfig, connection: sqlite3.Connection) -> None:
+        super().__init__(config, connection)
+        self._codec = MessageCodec(config.commit_types, config.footer_classes)
+        self._pending: list[tuple[str, Message]] = []
+        fingerprint = self.fingerprint(config)
+        row = connection.execute("SELECT value FROM meta WHERE key = 'fingerprint'").fetchone()
+        if row is None or row[0] != fingerprint:
+            connection.execute("DELETE FROM commits")
+            connection.execute(
+                "INSERT OR REPLACE INTO meta VALUES ('fingerprint', ?)", (fingerprint,)
+            )
+            connection.commit()
+
+    @staticmethod
+    def fingerprint(config: CommitizenConfig) -> str:
+        footer_classes = [
+            [prefix, klass.__module__, klass.__qualname__, klass.MULTIPLE_MAX, klass.LINES_MAX]
+            for prefix, klass in config.footer_classes.items()
+        ]
+        data = [__version__, list(config.commit_types), footer_classes]
+        return hashlib.sha256(json.dumps(data).encode("utf-8")).hexdigest()
+
+    def get(self, commit_hash: str) -> Optional[Message]:
+        row = self._connection.execute(
+            "SELECT data FROM commits WHERE hash = ?", (commit_hash,)
+        ).fetchone()
+        if row is None:
+            return None
+        return self._codec.decode(row[0])
+
+    def add(self, commit_hash: str, message: Message) -> None:
+        self._pending.append((commit_hash, message))
+
+    def close(self) -> None:
+        rows: list[tuple[str, str]] = []
+        for commit_hash, message in self._pending:
+            # Lazy messages nobody looked into, or whose parse failed, are left unparsed.
+            if not message.is_parsed:
+                continue
+            # Commits whose footers cannot be encoded are parsed on every run instead.
+            data = self._codec.encode(message)
+            if data is not None:
+                rows.append((commit_hash, data))
+        try:
+            self._connection.executemany("INSERT OR REPLACE INTO commits VALUES (?, ?)", rows)
+        except sqlite3.Error:
+            pass
+        self._pending = []
+        super().close()
+
+
+class SectionCache(BaseCache):
+    # mdformat output of one changelog section, keyed by the hash of its rendered markdown.
+    FILE_NAME = "sections.sqlite3"
+    SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS sections "
+        "(key TEXT PRIMARY KEY, data TEXT, last_used INTEGER);"
+    )
+    MAX_AGE = 30 * 24 * 60 * 60
+
+    def __init__(self, config: CommitizenConfig, connection: sqlite3.Connection) -> None:
+        super().__init__(config, connection)
+        self._now = int(time.time())
+        self._used: list[str] = []
+        self._pending: list[tuple[str, str]] = []
+        fingerprint = self.fingerprint()
+        row = connection.execute("SELECT value FROM meta WHERE key = 'fingerprint'").fetchone()
+        if row is None or row[0] != fingerprint:
+            connection.execute("DELETE FROM sections")
+            connection.execute(
+                "INSERT OR REPLACE INTO meta VALUES ('fingerprint', ?)", (fingerprint,)
+            )
+            connection.commit()
+
+    @staticmethod
+    def fingerprint() -> str:
+        # Another mdformat release may format the same markdown differently.
+        from importlib.metadata import version
+
+        data = [__version__, version("mdformat")]
+        return hashlib.sha256(json.dumps(data).encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def key(markdown: str) -> str:
+        return hashlib.sha256(markdown.encode("utf-8")).hexdigest()
+
+    def get(self, markdown: str) -> Optional[str]:
+        key = self.key(markdown)
+        row = self._connection.execute("SELECT data FROM sections WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        self._used.append(key)
+        data: str = row[0]
+        return data
+
+    def add(self, markdown: str, formatted: str) -> None:
+        self._pending.append((self.key(markdown), formatted))
+
+    def close(self) -> None:
+        try:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO sections VALUES (?, ?, ?)",
+                [(key, data, self._now) for key, data in self._pending],
+            )
+            self._connection.executemany(
+                "UPDATE sections SET last_used = ? WHERE key = ?",
+                [(self._now, key) for key in self._used],
+            )
+            # Sections of unreleased versions change with every commit and are never hit again.
+            self._connection.execute(
+                "DELETE FROM sections WHERE last_used < ?", (self._now - self.MAX_AGE,)
+            )
+        except sqlite3.Error:
+            pass
+        self._pending = []
+        self._used = []
+        super().close()
+
+
+class ConfigSnapshot:
+    # The pickled config of the last run, valid while config.py and the modules it imports
+    # are byte for byte the same. It comes from the repository like config.py itself, so
+    # unpickling it trusts nothing that exec'ing config.py would not.
+    FILE_NAME = "config.pickle"
+
+    @classmethod
+    def load(cls, cache_path: Path, source: bytes) -> Any:
+        try:
+            with open(f"{cache_path}/{cls.FILE_NAME}", "rb") as f:
+                key, files, data = pickle.load(f)
+            if key != cls.key(source):
+                return None
+            for path, digest in files:
+                if hashlib.sha256(Path(path).read_bytes()).hexdigest() != digest:
+                    return None
+            return pickle.loads(data)
+        except Exception:
+            # A missing, stale or unreadable snapshot only means config.py runs again.
+            return None
+
+    @classmethod
+    def save(cls, config: CommitizenConfig, source: bytes) -> None:
+        try:
+            data = pickle.dumps(config)
+        except (pickle.PicklingError, TypeError, AttributeError):
+            # Functions and classes defined in config.py itself can only be rebuilt by exec.
+            return
+        files = [
+            (path, hashlib.sha256(Path(path).read_bytes()).hexdigest())
+            for path in cls.imported_files(source)
+        ]
+        snapshot_path = Path(f"{config.cache_path}/{cls.FILE_NAME}")
+        temp_path = Path(f"{snapshot_path}.{os.getpid()}.tmp")
+        try:
+            prepare_cache_path(config.cache_path)
+            with open(temp_path, "wb") as f:
+                pickle.dump((cls.key(source), files, data), f)
+            os.replace(temp_path, snapshot_path)
+        except OSError:
+            temp_path.unlink(missing_ok=True)
+
+    @staticmethod
+    def key(source: bytes) -> str:
+        data = f"{__version__}\0{sys.version}\0".encode("utf-8") + source
+        return hashlib.sha256(data).hexdigest()
+
+    @staticmethod
+    def imported_files(source: bytes) -> list[str]:
+        module_names: set[str] = set()
+        for node in ast.walk(ast.parse(source)):
+            if isinstance(node, ast.Import):
+                module_names.update(alias.name for alias in node.names)
+            elif isinstance(node, ast.ImportFrom) and node.module and node.level == 0:
+                module_names.add(node.module)
+        files: list[str] = []
+        for name in sorted(module_names):
+            try:
+                spec = importlib.util.find_spec(name)
+            except (ImportError, ValueError):
+                continue
+            if spec and spec.origin and Path(spec.origin).is_file():
+                files.append(spec.origin)
+        return files
@@ -20,11 +20,21 @@ class BumpCommand(BaseCommand):
             name="no-commit",
             description="no commit",
         ),
+        Option(
+            name="packages",
+            description="Bump every package in the config from one pass over the history",
+        ),
     ]
 
     def handle(self) -> int:
         is_commit = not bool(self.option("no-commit"))
         prerelease: Optional[str] = self.option("prerelease")
+        if self.option("packages"):
+            if prerelease:
+                raise ValueError("--packages cannot be combined with --prerelease.")
+            for name, (current_version, next_version) in self.api.bump_packages(is_commit).items():
+                self.line(f"{name}: {current_version} → {next_version}")
+            return 0
         current_version, next_version = self.api.bump_version(prerelease, is_commit)
         self.line(f"Current: {current_version}")
         self.line(f"Next: {next_version}")
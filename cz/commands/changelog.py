@@ -1,8 +1,13 @@
+import os
+import tempfile
 from pathlib import Path
+from typing import Iterator
 from typing import Optional
 
 from cleo.io.inputs.option import Option
 
+from cz.profiling import profiler
+
 from .command import BaseCommand
 
 
@@ -12,7 +17,7 @@ class ChangeLogCommand(BaseCommand):
     options = [
         Option(
             name="incremental",
-            description="TODO",
+            description="Only render releases newer than the latest one in --file-name",
         ),
         Option(
             name="stdout",
@@ -26,28 +31,97 @@ class ChangeLogCommand(BaseCommand):
         ),
         Option(
             name="unreleased-version",
-            description="TODO",
+            description="Version name for the commits that are not tagged yet",
             flag=False,
             requires_value=True,
         ),
         Option(
             name="start-rev",
-            description="TODO",
+            description="Start the changelog after this revision",
+            flag=False,
+            requires_value=True,
+        ),
+        Option(
+            name="packages",
+            description="Write the changelog of every package in the config into its path",
+        ),
+        Option(
+            name="jobs",
+            description="Number of processes that read the history, one version per task",
+            shortcut="j",
             flag=False,
             requires_value=True,
+            default="1",
         ),
     ]
     aliases = ["ch"]
 
     def handle(self) -> int:
-        changelog = self.api.generate_changelog()
+        incremental: bool = self.option("incremental")
         stdout: bool = self.option("stdout")
         file_name: Optional[str] = self.option("file-name")
+        unreleased_version: Optional[str] = self.option("unreleased-version")
+        start_rev: Optional[str] = self.option("start-rev")
+        jobs = int(self.option("jobs"))
         file_path: Optional[Path] = None
         if file_name:
             file_path = Path(file_name)
-        if stdout:
-            self.line(changelog)
+
+        if incremental and start_rev:
+            raise ValueError("Only one option can be selected.")
+        if incremental and not file_path:
+            raise ValueError("--incremental requires --file-name.")
+        if self.option("packages"):
+            if incremental or start_rev:
+                raise ValueError("--packages cannot be combined with --incremental or --start-rev.")
+            for package, chunks in self.api.iter_package_changelogs(unreleased_version, jobs):
+                package_file_path = Path(
+                    f"{self.config.repository_path}/{package.path}/"
+                    f"{file_name or package.changelog_file_name}"
+                )
+                self.write_changelog(package_file_path, chunks, stdout)
+                if stdout:
+                    self.line("")
+            return 0
+
+        if incremental and file_path and file_path.exists():
+            chunks = self.api.iter_updated_changelog(
+                file_path.read_text(), unreleased_version, jobs
+            )
+        else:
+            chunks = self.api.iter_changelog(start_rev, unreleased_version, jobs)
         if file_path:
-            file_path.write_text(changelog)
+            self.write_changelog(file_path, chunks, stdout)
+        else:
+            for chunk in chunks:
+                if stdout:
+                    self.write(chunk)
+        if stdout:
+            self.line("")
         return 0
+
+    def write_changelog(self, file_path: Path, chunks: Iterator[str], stdout: bool) -> None:
+        # The sections go to a temporary file next to the changelog, which replaces it only
+        # once complete, so an error halfway leaves the old changelog in place.
+        fd, temp_name = tempfile.mkstemp(prefix=f".{file_path.name}.", dir=file_path.parent)
+        try:
+            with os.fdopen(fd, "w") as f:
+                for chunk in chunks:
+                    with profiler.span("write", is_event=False):
+                        f.write(chunk)
+                    if stdout:
+                        self.write(chunk)
+            if file_path.exists():
+                os.chmod(temp_name, file_path.stat().st_mode)
+            else:
+                os.chmod(temp_name, 0o666 & ~self.umask())
+            os.replace(temp_name, file_path)
+        except BaseException:
+            Path(temp_name).unlink(missing_ok=True)
+            raise
+
+    @staticmethod
+    def umask() -> int:
+        umask = os.umask(0)
+        os.umask(umask)
+        return umask
@@ -2,6 +2,7 @@ from pathlib import Path
 from typing import Optional
 
 from cleo.commands.command import Command
+from cleo.io.io import IO
 
 from cz.api.cz import CommitizenAPI
 from cz.config import CommitizenConfig
@@ -13,6 +14,13 @@ class BaseCommand(Command):
         self._config: Optional[CommitizenConfig] = None
         self._api: Optional[CommitizenAPI] = None
 
+    def execute(self, io: IO) -> int:
+        try:
+            return super().execute(io)
+        finally:
+            if self._api is not None:
+                self._api.close()
+
     @property
     def config(self) -> CommitizenConfig:
         if self._config is None:
@@ -1,12 +1,16 @@
+import json
 import re
 from pathlib import Path
+from typing import Iterator
 from typing import Optional
 
+from cleo.formatters.formatter import Formatter
 from cleo.io.inputs.option import Option
 
+from cz.conventional_commits.lint_error import LintError
+
 from .command import BaseCommand
 
-# TODO
 # cz lint --rev=<hash>
 # cz lint --rev=<tag>
 # cz lint --rev=<hash>..<hash>
@@ -14,21 +18,45 @@ from .command import BaseCommand
 
 
 class LintCommand(BaseCommand):
-    HASH_RANGE_REGEX = re.compile(r"(?P<start>[0-9a-f]{40})..(?P<end>[0-9a-f]{40})")
+    REV_RANGE_REGEX = re.compile(
+        r"(?P<start>[^.\s]+(?:\.[^.\s]+)*)\.\.(?P<end>[^.\s]+(?:\.[^.\s]+)*)"
+    )
     name = "lint"
     description = ""
     options = [
         Option(
             name="rev",
-            description="aaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaa",
+            description="Commit, tag or revision range (<start>..<end>) to lint",
             flag=False,
             requires_value=True,
         ),
         Option(
             name="commit-msg-file",
-            description="aaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaa",
+            description="File with the commit message to lint",
+            flag=False,
+            requires_value=True,
+        ),
+        Option(
+            name="format",
+            description="Report format of a range lint: text, json or ndjson",
+            flag=False,
+            requires_value=True,
+            default="text",
+        ),
+        Option(
+            name="max-errors",
+            description="Stop a range lint after this many errors (0 reports all)",
+            flag=False,
+            requires_value=True,
+            default="0",
+        ),
+        Option(
+            name="jobs",
+            description="Number of processes that validate the messages of a range",
+            shortcut="j",
             flag=False,
             requires_value=True,
+            default="1",
         ),
     ]
 
@@ -39,18 +67,46 @@ class LintCommand(BaseCommand):
         if isinstance(rev, str) and isinstance(commit_msg_file, str):
             raise ValueError("Only one option can be selected.")
 
+        report_format: str = self.option("format")
+        if report_format not in ("text", "json", "ndjson"):
+            raise ValueError(f"Unknown format: {report_format}")
+        max_errors = int(self.option("max-errors"))
+        jobs = int(self.option("jobs"))
+
         if rev:
-            result = self.HASH_RANGE_REGEX.fullmatch(rev)
+            result = self.REV_RANGE_REGEX.fullmatch(rev)
             if result:
-                self.api.lint_commits(
-                    start=result.group("start"), end=result.group("end")
+                errors = self.api.lint_commits(
+                    result.group("start"), result.group("end"), jobs, max_errors
                 )
+                return self.report(errors, report_format)
+            elif ".." not in rev:
+                self.api.lint_commit(rev)
             else:
                 raise ValueError("not rev format")
         elif commit_msg_file:
             commit_msg_path = Path(commit_msg_file)
             self.api.lint_message(commit_msg_path.read_text())
         else:
-            self.api.lint_commits()
+            return self.report(
+                self.api.lint_commits(jobs=jobs, max_errors=max_errors), report_format
+            )
 
         return 0
+
+    def report(self, errors: Iterator[LintError], report_format: str) -> int:
+        count = 0
+        if report_format == "json":
+            error_list = [error.to_dict() for error in errors]
+            count = len(error_list)
+            self.line(Formatter.escape(json.dumps(error_list, ensure_ascii=False, indent=2)))
+            return 1 if count else 0
+        for error in errors:
+            count += 1
+            if report_format == "ndjson":
+                text = json.dumps(error.to_dict(), ensure_ascii=False)
+            else:
+                line = f" line {error.line}" if error.line else ""
+                text = f"{error.hash[:7]} [{error.rule}]{line}: {error.message.splitlines()[0]}"
+            self.line(Formatter.escape(text))
+        return 1 if count else 0
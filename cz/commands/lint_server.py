@@ -0,0 +1,40 @@
+from pathlib import Path
+from typing import Optional
+
+from cleo.io.inputs.option import Option
+
+from cz.lint_client import default_socket_path
+from cz.lint_server import LintServer
+
+from .command import BaseCommand
+
+
+class LintServerCommand(BaseCommand):
+    name = "lint-server"
+    description = "Serve commit message lint requests from cz-lint over a Unix socket"
+    options = [
+        Option(
+            name="socket",
+            description="Socket path (default: $CZ_LINT_SOCKET or $XDG_RUNTIME_DIR/cz-lint.sock)",
+            flag=False,
+            requires_value=True,
+        ),
+        Option(
+            name="idle-timeout",
+            description="Exit after this many seconds without a request (0 never exits)",
+            flag=False,
+            requires_value=True,
+            default="3600",
+        ),
+    ]
+
+    def handle(self) -> int:
+        socket_option: Optional[str] = self.option("socket")
+        socket_path = Path(socket_option) if socket_option else default_socket_path()
+        with LintServer(socket_path) as server:
+            self.line(f"Listening on {socket_path}")
+            try:
+                server.serve(float(self.option("idle-timeout")))
+            except KeyboardInterrupt:
+                pass
+        return 0
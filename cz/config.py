@@ -4,16 +4,26 @@ from pathlib import Path
 from typing import TYPE_CHECKING
 from typing import Any
 from typing import Callable
+from typing import Literal
+from typing import Optional
 from typing import Type
 
-from jinja2 import Template
-from semver.version import Version
-
+from .cache import ConfigSnapshot
+from .cache import prepare_cache_path
 from .conventional_commits.commit_type import CommitType
+from .conventional_commits.message.parser import MessageParser
 from .defaults import format_tag
 from .defaults import init_version_files
+from .git.runner import GitRunner
+from .git.runner import PersistentGitRunner
+from .package import Package
+from .profiling import profiler
 
 if TYPE_CHECKING:
+    from jinja2 import Environment
+    from jinja2 import Template
+    from semver.version import Version
+
     from cz.conventional_commits.message.footer import BaseFooter
     from cz.conventional_commits.message.footer import FooterPrefixType
     from cz.versioning import BaseVersionFile
@@ -24,17 +34,35 @@ if TYPE_CHECKING:
     FormatTagFunc = Callable[[Version], str]
     InitVersionFilesFunc = Callable[["CommitizenConfig"], list[BaseVersionFile]]
 
+CACHE_DIRECTORY = ".cz/cache"
+
+CHANGELOG_TEMPLATE_NAME = "CHANGELOG.j2"
+
+BumpBackendType = Literal["porcelain", "plumbing"]
+GitBackendType = Literal["subprocess", "python"]
+
 
 class CommitizenConfig:
     DEFAULT_REPOSITORY_PATH = Path.cwd()
 
     @classmethod
     def load(cls, repository_path: Path) -> "CommitizenConfig":
-        config_file = Path(f"{repository_path}/.cz/config.py")
-        local_data: dict[str, Any] = {}
-        exec(compile(config_file.read_text(), config_file, "exec"), {}, local_data)
-        config: CommitizenConfig = local_data["config"]
-        config.set_repository_path(repository_path)
+        with profiler.span("config.load"):
+            config_file = Path(f"{repository_path}/.cz/config.py")
+            source = config_file.read_bytes()
+            config: CommitizenConfig
+            snapshot = ConfigSnapshot.load(Path(f"{repository_path}/{CACHE_DIRECTORY}"), source)
+            if isinstance(snapshot, cls):
+                config = snapshot
+                profiler.count("config.snapshot_hits")
+            else:
+                local_data: dict[str, Any] = {}
+                exec(compile(source, config_file, "exec"), {}, local_data)
+                config = local_data["config"]
+                config.set_repository_path(repository_path)
+                if config.cache_enabled:
+                    ConfigSnapshot.save(config, source)
+            config.set_repository_path(repository_path)
         return config
 
     def __init__(self) -> None:
@@ -47,17 +75,38 @@ class CommitizenConfig:
         self.titles: dict[CommitType, str] = {}
         self.bump_map: dict[CommitType, VersionAttributes] = {}
         self.questions: dict[str, Question] = {}
+        self.cache_enabled = True
+        self.bump_backend: BumpBackendType = "porcelain"
+        self.git_backend: GitBackendType = "subprocess"
+        self.git_runner_class: Type[GitRunner] = PersistentGitRunner
+        self._message_parser: Optional[MessageParser] = None
+        self.packages: dict[str, Package] = {}
+        self._changelog_template: Optional[Template] = None
 
     def set_repository_path(self, path: Path | str) -> None:
         self.repository_path = Path(path) if isinstance(path, str) else path
         self.repository_path.resolve()
 
+    @property
+    def cache_path(self) -> Path:
+        return Path(f"{self.repository_path}/{CACHE_DIRECTORY}")
+
+    def set_cache_enabled(self, enabled: bool) -> None:
+        self.cache_enabled = enabled
+
     @property
     def changelog_template(self) -> Template:
-        if "_template" not in self.__dict__:
-            s = Path(f"{self.repository_path}/.cz/CHANGELOG.j2").read_text()
-            self._changelog_template = Template(s)
-        return self._changelog_template
+        if self._changelog_template is not None:
+            return self._changelog_template
+        return self.get_changelog_template(CHANGELOG_TEMPLATE_NAME)
+
+    def get_changelog_template(self, name: str) -> Template:
+        # The environment keeps the compiled template until the template file changes.
+        environment = get_template_environment(
+            Path(f"{self.repository_path}/.cz"),
+            Path(f"{self.cache_path}/jinja") if self.cache_enabled else None,
+        )
+        return environment.get_template(name)
 
     def set_changelog_template(self, template: Template) -> None:
         self._changelog_template = template
@@ -71,10 +120,37 @@ class CommitizenConfig:
     def set_format_tag_fn(self, fn: FormatTagFunc) -> None:
         self.format_tag_fn = fn
 
+    def set_bump_backend(self, backend: BumpBackendType) -> None:
+        # "plumbing" commits and tags in one ref transaction without running git hooks.
+        self.bump_backend = backend
+
+    def set_git_backend(self, backend: GitBackendType) -> None:
+        # "python" reads commits, tags and refs straight from .git without a git binary.
+        self.git_backend = backend
+
+    def set_git_runner_class(self, klass: Type[GitRunner]) -> None:
+        # GitRunner spawns git for every call; PersistentGitRunner keeps cat-file open.
+        self.git_runner_class = klass
+
+    @property
+    def message_parser(self) -> MessageParser:
+        # Built once and shared by every parse until a commit type or footer class is added.
+        if self._message_parser is None:
+            self._message_parser = MessageParser(self.commit_types, self.footer_classes)
+        return self._message_parser
+
     def create_comit_type(self, name: str) -> CommitType:
         commit_type = self.commit_types.setdefault(name, CommitType(name))
+        self._message_parser = None
         return commit_type
 
+    def create_package(self, name: str, path: str) -> Package:
+        # Commits that change files under the path go into the package's changelog and bump.
+        package = self.packages.setdefault(name, Package(name, path))
+        if package.path != path.strip("/"):
+            raise ValueError(f"The package {name} is already at {package.path}")
+        return package
+
     def add_title(self, commit_type: CommitType, title: str) -> None:
         self.titles.setdefault(commit_type, title)
 
@@ -86,4 +162,34 @@ class CommitizenConfig:
     def add_footer_class(self, klass: Type[BaseFooter]) -> None:
         if "PREFIX" not in klass.__dict__:
             raise RuntimeError()
+        if ":" in klass.PREFIX:
+            raise ValueError(f'Footer prefix must not contain ":": {klass.PREFIX}')
         self.footer_classes[klass.PREFIX] = klass
+        self._message_parser = None
+
+
+_template_environments: dict[tuple[Path, Optional[Path]], Environment] = {}
+
+
+def get_template_environment(
+    template_path: Path, bytecode_cache_path: Optional[Path]
+) -> Environment:
+    key = (template_path.resolve(), bytecode_cache_path)
+    environment = _template_environments.get(key)
+    if environment is None:
+        from jinja2 import Environment
+        from jinja2 import FileSystemBytecodeCache
+        from jinja2 import FileSystemLoader
+
+        bytecode_cache = None
+        if bytecode_cache_path is not None:
+            try:
+                prepare_cache_path(bytecode_cache_path)
+                bytecode_cache = FileSystemBytecodeCache(f"{bytecode_cache_path}")
+            except OSError:
+                pass
+        environment = Environment(
+            loader=FileSystemLoader(template_path), bytecode_cache=bytecode_cache
+        )
+        _template_environments[key] = environment
+    return environment
@@ -9,12 +9,33 @@ if TYPE_CHECKING:
 
 
 class Hash:
+    __slots__ = ("digest", "short_length")
+
     def __init__(self, long: str, short: str) -> None:
-        self.long = long
-        self.shor = short
+        self.digest = bytes.fromhex(long)
+        self.short_length = len(short)
+
+    @property
+    def long(self) -> str:
+        return self.digest.hex()
+
+    @property
+    def shor(self) -> str:
+        return self.digest.hex()[: self.short_length]
 
 
 class ConventionalCommit:
+    __slots__ = (
+        "hash",
+        "author",
+        "committer",
+        "message",
+        "tags",
+        "type",
+        "scope",
+        "is_breaking",
+    )
+
     def __init__(
         self,
         hash: Hash,
@@ -8,6 +8,8 @@ if TYPE_CHECKING:
 
 
 class CommitGroup:
+    __slots__ = ("commit_type", "title", "commits")
+
     def __init__(
         self,
         commit_type: CommitType,
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import importlib
+from array import array
+from collections import Counter
+from typing import Any
+from typing import Optional
+
+NO_ID = -1
+
+
+class CommitHistory:
+    # One row per commit in "git log" order, so each version occupies a contiguous range.
+    # Strings live in the side tables; the columns only hold their integer ids.
+    COLUMNS = ("author_times", "committer_times", "types", "scopes", "breaking", "versions")
+
+    def __init__(self, type_names: list[str]) -> None:
+        self.hashes = bytearray()
+        self.author_times = array("q")
+        self.committer_times = array("q")
+        self.types = array("h")
+        self.scopes = array("i")
+        self.breaking = array("b")
+        self.versions = array("i")
+        self.type_names = list(type_names)
+        self.type_ids = {name: i for i, name in enumerate(self.type_names)}
+        self.scope_names: list[str] = []
+        self.scope_ids: dict[str, int] = {}
+        self.version_names: list[str] = []
+        self.version_ranges: dict[str, tuple[int, int]] = {}
+
+    def __len__(self) -> int:
+        return len(self.types)
+
+    def append(
+        self,
+        commit_hash: str,
+        author_time: int,
+        committer_time: int,
+        type_name: str,
+        scope: Optional[str],
+        is_breaking: bool,
+        version: Optional[str],
+    ) -> None:
+        row = len(self.types)
+        self.hashes += bytes.fromhex(commit_hash)
+        self.author_times.append(author_time)
+        self.committer_times.append(committer_time)
+        self.types.append(self._intern(type_name, self.type_names, self.type_ids))
+        self.scopes.append(
+            self._intern(scope, self.scope_names, self.scope_ids) if scope else NO_ID
+        )
+        self.breaking.append(is_breaking)
+        if version is None:
+            self.versions.append(NO_ID)
+            return
+        if version in self.version_ranges:
+            start, stop = self.version_ranges[version]
+            if stop != row:
+                raise ValueError(f"Commits of {version} are not contiguous.")
+            self.version_ranges[version] = (start, row + 1)
+        else:
+            self.version_names.append(version)
+            self.version_ranges[version] = (row, row + 1)
+        self.versions.append(len(self.version_names) - 1)
+
+    @staticmethod
+    def _intern(name: str, names: list[str], ids: dict[str, int]) -> int:
+        i = ids.get(name)
+        if i is None:
+            i = ids[name] = len(names)
+            names.append(name)
+        return i
+
+    def hash(self, row: int) -> str:
+        size = len(self.hashes) // len(self.types)
+        return self.hashes[row * size : (row + 1) * size].hex()
+
+    def rows(self, version: Optional[str] = None) -> slice:
+        if version is None:
+            return slice(0, len(self))
+        return slice(*self.version_ranges[version])
+
+    def column(self, name: str, version: Optional[str] = None) -> memoryview:
+        if name not in self.COLUMNS:
+            raise ValueError(f"Unknown column: {name}")
+        # A memoryview slice shares the array's buffer instead of copying it.
+        column: array[int] = getattr(self, name)
+        return memoryview(column)[self.rows(version)]
+
+    def count_types(self, version: Optional[str] = None) -> dict[str, int]:
+        counts = Counter(self.column("types", version))
+        return {self.type_names[i]: count for i, count in sorted(counts.items())}
+
+    def count_types_per_version(self) -> dict[str, dict[str, int]]:
+        return {version: self.count_types(version) for version in self.version_names}
+
+    def to_numpy(self) -> dict[str, Any]:
+        try:
+            numpy = importlib.import_module("numpy")
+        except ImportError:
+            raise RuntimeError(
+                'numpy is required for CommitHistory.to_numpy(). Install "cz[analytics]".'
+            )
+        columns: dict[str, Any] = {}
+        for name in self.COLUMNS:
+            column: array[int] = getattr(self, name)
+            columns[name] = numpy.frombuffer(column, dtype=column.typecode)
+        return columns
@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+from typing import Any
+from typing import Optional
+
+
+class LintError:
+    __slots__ = ("hash", "rule", "line", "message")
+
+    def __init__(self, hash: str, rule: str, line: Optional[int], message: str) -> None:
+        self.hash = hash
+        self.rule = rule
+        self.line = line
+        self.message = message
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"hash": self.hash, "rule": self.rule, "line": self.line, "message": self.message}
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__}: {self.hash[:7]} {self.rule}>"
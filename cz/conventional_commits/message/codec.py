@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import json
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import Optional
+from typing import Type
+
+from .message import Message
+
+if TYPE_CHECKING:
+    from cz.conventional_commits.commit_type import CommitType
+
+    from .footer import BaseFooter
+    from .footer import FooterPrefixType
+
+
+class MessageCodec:
+    def __init__(
+        self,
+        commit_types: dict[str, CommitType],
+        footer_classes: dict[FooterPrefixType, Type[BaseFooter]],
+    ) -> None:
+        self.COMMIT_TYPES = commit_types
+        self.FOOTER_CLASSES = footer_classes
+
+    def encode(self, message: Message) -> Optional[str]:
+        data = {
+            "type": message.commit_type.name,
+            "scope": message.scope,
+            "breaking": message.is_breaking,
+            "subject": message.subject,
+            "body": message.body,
+            "footer": {prefix: vars(footer) for prefix, footer in message.footer.items()},
+        }
+        try:
+            return json.dumps(data)
+        except TypeError:
+            # Custom footers may hold state that has no JSON form.
+            return None
+
+    def decode(self, data: str) -> Message:
+        values: dict[str, Any] = json.loads(data)
+        footer: dict[str, Any] = {}
+        message = Message(
+            commit_type=self.COMMIT_TYPES[values["type"]],
+            scope=values["scope"],
+            is_breaking=values["breaking"],
+            subject=values["subject"],
+            body=values["body"],
+            footer=footer,
+        )
+        for prefix, state in values["footer"].items():
+            klass = self.FOOTER_CLASSES[prefix]
+            instance = klass.__new__(klass)
+            instance.__dict__.update(state)
+            footer[prefix] = instance
+        return message
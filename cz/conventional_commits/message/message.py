@@ -8,8 +8,12 @@ from typing import Optional
 if TYPE_CHECKING:
     from cz.conventional_commits.commit_type import CommitType
 
+    from .parser import MessageParser
+
 
 class Message:
+    __slots__ = ("commit_type", "scope", "is_breaking", "subject", "body", "footer")
+
     def __init__(
         self,
         commit_type: CommitType,
@@ -26,6 +30,10 @@ class Message:
         self.body = body
         self.footer = footer
 
+    @property
+    def is_parsed(self) -> bool:
+        return True
+
     def subject_to_markdown(self, url: str) -> str:
         subject = self.subject
         closes: list[str] = re.findall(r"#\d+", subject)
@@ -51,3 +59,53 @@ class Message:
             footer = footer.rstrip()
             msg = f"{msg}\n\n{footer}"
         return msg
+
+
+class LazyMessage(Message):
+    __slots__ = ("_raw", "_parser", "_body", "_footer")
+
+    def __init__(
+        self,
+        commit_type: CommitType,
+        scope: Optional[str],
+        is_breaking: bool,
+        subject: str,
+        raw: str,
+        parser: MessageParser,
+    ):
+        self._raw: Optional[str] = raw
+        self._parser = parser
+        super().__init__(commit_type, scope, is_breaking, subject, None, {})
+
+    @property
+    def is_parsed(self) -> bool:
+        return self._raw is None
+
+    @property
+    def body(self) -> Optional[str]:
+        self._parse()
+        return self._body
+
+    @body.setter
+    def body(self, body: Optional[str]) -> None:
+        self._body = body
+
+    @property
+    def footer(self) -> dict[str, Any]:
+        self._parse()
+        return self._footer
+
+    @footer.setter
+    def footer(self, footer: dict[str, Any]) -> None:
+        self._footer = footer
+
+    def _parse(self) -> None:
+        if self._raw is not None:
+            # _raw is cleared first because the parser reads body and footer back. A failed
+            # parse puts it back, so the message stays unparsed and every access raises.
+            raw, self._raw = self._raw, None
+            try:
+                self._parser.parse_body_and_footer(self, raw.split("\n"))
+            except BaseException:
+                self._raw, self._body, self._footer = raw, None, {}
+                raise
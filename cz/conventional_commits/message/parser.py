@@ -6,6 +6,7 @@ from typing import Any
 from typing import Literal
 from typing import Type
 
+from cz.conventional_commits.message.message import LazyMessage
 from cz.conventional_commits.message.message import Message
 from cz.exceptions import InvalidCommitMessageError
 
@@ -18,26 +19,52 @@ if TYPE_CHECKING:
 
 
 class MessageParser:
+    # The type is matched generically and looked up in COMMIT_TYPES, so the regex does not
+    # grow with the number of commit types.
+    FIRST_LINE_REGEX = re.compile(
+        r"(?P<type>[^\s():!]+)(?:\((?P<scope>\w+)\))?(?P<breaking>!)?: (?P<subject>.+)"
+    )
+
     def __init__(
         self,
         commit_types: dict[str, CommitType],
         footer_classes: dict[FooterPrefixType, Type[BaseFooter]],
     ) -> None:
         self.COMMIT_TYPES = commit_types
-        self.FIRST_LINE_REGEX = re.compile(
+        self.FOOTER_CLASSES = footer_classes
+        # Footer prefixes never contain ":", so a line is dispatched with one partition.
+        self.FOOTER_DISPATCH = {
+            prefix: (i, klass) for i, (prefix, klass) in enumerate(footer_classes.items())
+        }
+
+    @property
+    def first_line_pattern(self) -> str:
+        return (
             r"(?P<type>"
-            + "|".join(commit_types)
+            + "|".join(self.COMMIT_TYPES)
             + r")"
             + r"(?:\((?P<scope>\w+)\))?(?P<breaking>!)?: (?P<subject>.+)"
         )
-        self.FOOTER_CLASSES = footer_classes
 
-    def parse(self, msg: str) -> Message:
+    def parse(self, msg: str, strict: bool = True) -> Message:
         msg = msg.rstrip()
-        lines = msg.split("\n")
+        if strict:
+            lines = msg.split("\n")
+        else:
+            lines = [msg.partition("\n")[0]]
         first_line = self.parse_1st_line(lines)
-        footer: dict[str, Any] = {}
         commit_type = self.COMMIT_TYPES[first_line["type"]]
+        if not strict:
+            return LazyMessage(
+                commit_type=commit_type,
+                scope=first_line["scope"],
+                is_breaking=True if first_line["breaking"] else False,
+                subject=first_line["subject"],
+                raw=msg,
+                parser=self,
+            )
+
+        footer: dict[str, Any] = {}
         message = Message(
             commit_type=commit_type,
             scope=first_line["scope"],
@@ -46,21 +73,28 @@ class MessageParser:
             body=None,
             footer=footer,
         )
+        self.parse_body_and_footer(message, lines)
+        return message
 
+    def parse_body_and_footer(self, message: Message, lines: list[str]) -> None:
         if len(lines) > 1:
             self.must_blank_line(lines, 1)
-            body_lines, footer_types = self.parse_after_2nd_lines(lines[2:])
+            body_lines, footer_types, footer_line_numbers = self.parse_after_2nd_lines(lines[2:])
 
             message.body = "\n".join(body_lines)
             for prefix in footer_types:
                 klass = self.FOOTER_CLASSES[prefix]
-                message.footer[prefix] = klass(message=message, footer=footer_types)
-
-        return message
+                try:
+                    message.footer[prefix] = klass(message=message, footer=footer_types)
+                except Exception as e:
+                    # A footer class that fails in any way is an invalid footer, not a crash.
+                    raise InvalidCommitMessageError(
+                        f"{e}", f"footer:{prefix}", footer_line_numbers[prefix]
+                    ) from e
 
     def parse_1st_line(self, lines: list[str]) -> dict[str, str]:
         result = self.FIRST_LINE_REGEX.fullmatch(lines[0])
-        if not result:
+        if not result or result.group("type") not in self.COMMIT_TYPES:
             raise InvalidCommitMessageError(
                 """Commit alidation: 1st line failed!
 please enter a commit message in the conventional commits format.
@@ -77,54 +111,66 @@ Failure example:
   - Don't include extra space
 - feat:add a
   - Please open a space to the right of colon""".format(
-                    self.FIRST_LINE_REGEX.pattern
-                )
+                    self.first_line_pattern
+                ),
+                "first-line",
+                1,
             )
         return result.groupdict()
 
     def parse_after_2nd_lines(
         self, lines: list[str]
-    ) -> tuple[list[str], AllFooterLinesType]:
+    ) -> tuple[list[str], AllFooterLinesType, dict[FooterPrefixType, int]]:
         body: list[str] = []
         footer: AllFooterLinesType = {}
+        # the line each kind of footer starts on, for errors found by the footer classes
+        footer_line_numbers: dict[FooterPrefixType, int] = {}
         phase: Literal["BODY"] | Type[BaseFooter] = "BODY"
         footer_lines: list[str] = []
         footer_now_index = 0
-        for line in lines:
-            for i, klass in enumerate(self.FOOTER_CLASSES.values()):
-                if line.startswith(f"{klass.PREFIX}:"):
-                    if i < footer_now_index:
-                        raise RuntimeError("順序が違います。")
-                    if footer_lines and footer_lines[len(footer_lines) - 1] == "":
-                        raise RuntimeError("改行いれないで")
-                    footer_lines = []
-
-                    target_footers = footer.setdefault(klass.PREFIX, [])
-                    if (
-                        klass.MULTIPLE_MAX > 0
-                        and len(target_footers) >= klass.MULTIPLE_MAX
-                    ):
-                        raise RuntimeError("AA")
-                    target_footers.append(footer_lines)
-
-                    footer_now_index = i
-                    phase = klass
-                    break
+        # Line numbers are 1-based and count from the subject, which is parsed separately.
+        for number, line in enumerate(lines, 3):
+            prefix, colon, _ = line.partition(":")
+            dispatch = self.FOOTER_DISPATCH.get(prefix) if colon else None
+            if dispatch:
+                i, klass = dispatch
+                if i < footer_now_index:
+                    raise InvalidCommitMessageError(
+                        "順序が違います。",
+                        "footer-order",
+                        number,
+                    )
+                if footer_lines and footer_lines[len(footer_lines) - 1] == "":
+                    raise InvalidCommitMessageError(
+                        "改行いれないで",
+                        "footer-blank-line",
+                        number - 1,
+                    )
+                footer_lines = []
+
+                target_footers = footer.setdefault(klass.PREFIX, [])
+                if klass.MULTIPLE_MAX > 0 and len(target_footers) >= klass.MULTIPLE_MAX:
+                    raise InvalidCommitMessageError("AA", "footer-multiple-max", number)
+                target_footers.append(footer_lines)
+                footer_line_numbers.setdefault(klass.PREFIX, number)
+
+                footer_now_index = i
+                phase = klass
             if phase == "BODY":
                 body.append(line)
             else:
-                if (
-                    line != ""
-                    and phase.LINES_MAX > 0
-                    and len(footer_lines) >= phase.LINES_MAX
-                ):
-                    raise RuntimeError("BB")
+                if line != "" and phase.LINES_MAX > 0 and len(footer_lines) >= phase.LINES_MAX:
+                    raise InvalidCommitMessageError("BB", "footer-lines-max", number)
                 footer_lines.append(line)
         if body and body[len(body) - 1] != "":
-            raise RuntimeError("body 改行を入れてね")
+            raise InvalidCommitMessageError(
+                "body 改行を入れてね", "body-trailing-blank-line", len(body) + 2
+            )
         if footer_lines and footer_lines[len(footer_lines) - 1] == "":
-            raise RuntimeError("last 改行いれないで")
-        return body, footer
+            raise InvalidCommitMessageError(
+                "last 改行いれないで", "footer-trailing-blank-line", len(lines) + 2
+            )
+        return body, footer, footer_line_numbers
 
     def must_blank_line(self, lines: list[str], pos: int) -> None:
         if (
@@ -141,5 +187,7 @@ Commit Format:
 <BLANK LINE>
 <footer>""".format(
                     pos
-                )
+                ),
+                "blank-line",
+                pos + 1,
             )
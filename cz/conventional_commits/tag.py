@@ -7,6 +7,7 @@ if TYPE_CHECKING:
 
 
 class Tag:
+    __slots__ = ("commit_id", "name", "creator")
     type = "lightweight"
 
     def __init__(self, name: str, commit_id: str, creator: User) -> None:
@@ -19,4 +20,5 @@ class Tag:
 
 
 class AnnotatedTag(Tag):
+    __slots__ = ()
     type = "annotated"
@@ -1,8 +1,16 @@
+import sys
 from datetime import datetime
 
 
 class User:
+    __slots__ = ("name", "email", "unix_time")
+
     def __init__(self, name: str, email: str, unix_time: int):
-        self.name = name
-        self.email = email
-        self.datetime = datetime.fromtimestamp(unix_time)
+        # The same few authors sign most commits, so their strings are shared.
+        self.name = sys.intern(name)
+        self.email = sys.intern(email)
+        self.unix_time = unix_time
+
+    @property
+    def datetime(self) -> datetime:
+        return datetime.fromtimestamp(self.unix_time)
@@ -9,6 +9,8 @@ if TYPE_CHECKING:
 
 
 class VersionGroup:
+    __slots__ = ("tag", "commit_groups", "notes", "next", "previous")
+
     def __init__(
         self, tag: Tag, commit_groups: dict[str, CommitGroup] = {}, notes: list[str] = []
     ) -> None:
@@ -1,15 +1,41 @@
+from importlib import import_module
+from typing import Optional
+
 from cleo.application import Application
+from cleo.commands.command import Command
+from cleo.exceptions import CleoException
+from cleo.formatters.formatter import Formatter
 from cleo.io.inputs.option import Option
+from cleo.io.io import IO
+from cleo.loaders.factory_command_loader import Factory
+from cleo.loaders.factory_command_loader import FactoryCommandLoader
 
 from .__version__ import __version__
-from .commands.bump import BumpCommand
-from .commands.changelog import ChangeLogCommand
-from .commands.commit import CommitCommand
-from .commands.init import InitCommand
-from .commands.lint import LintCommand
 
 APP_NAME = "cz"
 
+# name: (module in cz.commands, class); a command module is only imported when it runs.
+COMMANDS = {
+    "bump": ("bump", "BumpCommand"),
+    "changelog": ("changelog", "ChangeLogCommand"),
+    "ch": ("changelog", "ChangeLogCommand"),
+    "commit": ("commit", "CommitCommand"),
+    "c": ("commit", "CommitCommand"),
+    "init": ("init", "InitCommand"),
+    "lint": ("lint", "LintCommand"),
+    "lint-server": ("lint_server", "LintServerCommand"),
+}
+
+
+def load_command(module_name: str, class_name: str) -> Factory:
+    def factory() -> Command:
+        command_class: type[Command] = getattr(
+            import_module(f".commands.{module_name}", __package__), class_name
+        )
+        return command_class()
+
+    return factory
+
 
 class CommitizenCLI(Application):
     def __init__(self) -> None:
@@ -23,8 +49,39 @@ class CommitizenCLI(Application):
                 requires_value=True,
             )
         )
-        self.add(BumpCommand())
-        self.add(ChangeLogCommand())
-        self.add(CommitCommand())
-        self.add(InitCommand())
-        self.add(LintCommand())
+        self.definition.add_option(
+            Option(
+                name="profile",
+                description="Time the stages of the command: summary, trace:<file> (Chrome "
+                "trace JSON) or cprofile[:<file>]",
+                flag=False,
+                requires_value=True,
+            )
+        )
+        self.set_command_loader(
+            FactoryCommandLoader({name: load_command(*target) for name, target in COMMANDS.items()})
+        )
+
+    def _run_command(self, command: Command, io: IO) -> int:
+        profile = self._profile_mode(command, io)
+        if not profile:
+            return super()._run_command(command, io)
+        from .profiling import run_profiled
+
+        return run_profiled(
+            profile,
+            lambda: super(CommitizenCLI, self)._run_command(command, io),
+            lambda line: io.write_error_line(Formatter.escape(line)),
+        )
+
+    @staticmethod
+    def _profile_mode(command: Command, io: IO) -> Optional[str]:
+        # parameter_option() cuts "--option=value" down to its first character, so the input
+        # is bound the way Command.run binds it.
+        try:
+            command.merge_application_definition()
+            io.input.bind(command.definition)
+        except CleoException:
+            return None  # the command reports the invalid input itself
+        profile: Optional[str] = io.input.option("profile")
+        return profile
@@ -7,18 +7,18 @@ from typing import TYPE_CHECKING
 from typing import Any
 from typing import cast
 
-import questionary
-from semver.version import Version
-from tomlkit import dumps
-from tomlkit import parse
-
 from cz.conventional_commits.message.footer import AllFooterLinesType
 from cz.conventional_commits.message.footer import BaseFooter
 from cz.versioning import BaseVersionFile
+from cz.versioning import RegexVersionFile
+from cz.versioning import TOMLVersionFile
 
 if TYPE_CHECKING:
+    from semver.version import Version
+
     from cz.config import CommitizenConfig
     from cz.conventional_commits.message.message import Message
+    from cz.package import Package
     from cz.question import QuestionPatternB
 
 
@@ -30,6 +30,8 @@ class BreakingChangeFooter(BaseFooter):
     @classmethod
     def ask(cls, message: Message, question: QuestionPatternB) -> None:
         if message.is_breaking:
+            import questionary
+
             note: str = questionary.text(question["subject"], multiline=True).ask()
             note = re.sub(r"\n\n+", "\n", note)
             note = note.rstrip()
@@ -49,7 +51,7 @@ class BreakingChangeFooter(BaseFooter):
         if not message.is_breaking:
             raise ValueError("flgを立ててください")
         if len(breaking_change_lines) == 1:
-            if breaking_change_lines[0][len(self.PREFIX) + 1] != " ":
+            if not breaking_change_lines[0].startswith(f"{self.PREFIX}: "):
                 raise ValueError("1行で書く場合は、spaceを開けて")
             breaking_change_lines[0] = breaking_change_lines[0].strip(f"{self.PREFIX}: ")
             self.body = "\n".join(breaking_change_lines)
@@ -95,6 +97,8 @@ class ClosesFooter(BaseFooter):
 
     @classmethod
     def ask(cls, message: Message, question: QuestionPatternB) -> None:
+        import questionary
+
         closes: set[int] = set()
         while True:
             close_string: str = questionary.text(question["subject"]).ask()
@@ -130,47 +134,18 @@ class ClosesFooter(BaseFooter):
         return self.raw
 
 
-class PyProjectTOML(BaseVersionFile):
+class PyProjectTOML(TOMLVersionFile):
     def __init__(self, path: Path | str = Path.cwd()) -> None:
-        self.PATH = Path(f"{path}/pyproject.toml")
-        self._data = parse(self.PATH.read_text())
-        self.name = cast(str, self._data["tool"]["poetry"]["name"])  # type: ignore
-
-    def get_path(self) -> Path:
-        return self.PATH
+        super().__init__(Path(f"{path}/pyproject.toml"), ("tool", "poetry", "version"))
+        self.load()
+        self.name = cast(str, self.document["tool"]["poetry"]["name"])
 
-    def get_version(self) -> str:
-        return self._data["tool"]["poetry"]["version"]  # type: ignore
 
-    def set_version(self, version: str) -> None:
-        self._data["tool"]["poetry"]["version"] = version  # type: ignore
-
-    def save(self) -> None:
-        self.PATH.write_text(dumps(self._data))
-
-
-class ModuleVersionFile(BaseVersionFile):
-    PACKAGE_VERSION_REGEX = re.compile(r'^__version__ = "(?P<version>.+)"')
+class ModuleVersionFile(RegexVersionFile):
+    PACKAGE_VERSION_REGEX = re.compile(r'^__version__ = "(?P<version>[^"\n]+)"', re.MULTILINE)
 
     def __init__(self, module_path: str) -> None:
-        self.PATH = Path(f"{module_path}/__version__.py")
-        text = self.PATH.read_text().split("\n")[0]
-        result = self.PACKAGE_VERSION_REGEX.fullmatch(text)
-        if not result:
-            raise RuntimeError(f"__version__ not in {self.PATH}")
-        self._version: str = result.group("version")
-
-    def get_path(self) -> Path:
-        return self.PATH
-
-    def get_version(self) -> str:
-        return self._version
-
-    def set_version(self, version: str) -> None:
-        self._version = version
-
-    def save(self) -> None:
-        self.PATH.write_text(f'__version__ = "{self._version}"\n')
+        super().__init__(Path(f"{module_path}/__version__.py"), self.PACKAGE_VERSION_REGEX)
 
 
 def format_tag(next_version: Version) -> str:
@@ -183,3 +158,12 @@ def init_version_files(config: CommitizenConfig) -> list[BaseVersionFile]:
     files.append(pyproject)
     files.append(ModuleVersionFile(f"{config.repository_path}/{pyproject.name}"))
     return files
+
+
+def init_package_version_files(config: CommitizenConfig, package: Package) -> list[BaseVersionFile]:
+    files: list[BaseVersionFile] = []
+    package_path = f"{config.repository_path}/{package.path}"
+    pyproject = PyProjectTOML(package_path)
+    files.append(pyproject)
+    files.append(ModuleVersionFile(f"{package_path}/{pyproject.name}"))
+    return files
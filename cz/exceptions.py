@@ -1,6 +1,12 @@
+from typing import Optional
+
+
 class InvalidVersionError(Exception):
     pass
 
 
 class InvalidCommitMessageError(Exception):
-    pass
+    def __init__(self, message: str, rule: str = "", line: Optional[int] = None) -> None:
+        super().__init__(message)
+        self.rule = rule
+        self.line = line
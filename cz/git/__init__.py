@@ -0,0 +1,6 @@
+from .backend import BaseGitBackend
+from .backend import PythonGitBackend
+from .backend import SubprocessGitBackend
+from .repository import Repository
+
+__all__ = ["BaseGitBackend", "PythonGitBackend", "SubprocessGitBackend", "Repository"]
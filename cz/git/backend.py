@@ -0,0 +1,269 @@
+from __future__ import annotations
+
+from abc import ABC
+from abc import abstractmethod
+from typing import TYPE_CHECKING
+from typing import Iterator
+from typing import Optional
+
+from .objects import CommitObject
+from .objects import TagObject
+from .repository import Repository
+from .runner import GitRunner
+
+if TYPE_CHECKING:
+    from cz.config import CommitizenConfig
+
+# hash, abbreviated hash, author name/email/time, committer name/email/time, raw body
+CommitRecordType = list[str]
+# commit record, paths the commit changed
+CommitPathsRecordType = tuple[CommitRecordType, list[str]]
+# hash, subject (the first paragraph of the message on one line)
+SubjectRecordType = tuple[str, str]
+# object type, object name, peeled commit (annotated tags only), short name, creator
+TagRecordType = list[str]
+
+
+class BaseGitBackend(ABC):
+    SHORT_HASH_LENGTH = 7
+
+    def __init__(self, config: CommitizenConfig, runner: GitRunner) -> None:
+        self._config = config
+        self._runner = runner
+
+    @classmethod
+    def create(cls, config: CommitizenConfig, runner: GitRunner) -> BaseGitBackend:
+        if config.git_backend == "python":
+            return PythonGitBackend(config, runner)
+        return SubprocessGitBackend(config, runner)
+
+    @abstractmethod
+    def log(self, revision_range: str) -> Iterator[CommitRecordType]:
+        pass
+
+    @abstractmethod
+    def log_paths(self, revision_range: str) -> Iterator[CommitPathsRecordType]:
+        pass
+
+    @abstractmethod
+    def log_subjects(self, revision_range: str) -> Iterator[SubjectRecordType]:
+        pass
+
+    @abstractmethod
+    def rev_list(self, revision_range: str) -> Iterator[str]:
+        pass
+
+    @abstractmethod
+    def tags(self) -> Iterator[TagRecordType]:
+        pass
+
+    @abstractmethod
+    def merged_tags(self, start: Optional[str], end: str) -> list[str]:
+        pass
+
+    @abstractmethod
+    def read_commit(self, rev: str) -> Optional[CommitRecordType]:
+        pass
+
+
+class SubprocessGitBackend(BaseGitBackend):
+    LOG_SEPARATOR = "@@__CZ__@@"
+    LOG_DELIMITER = "@@__CZ_DELIMITER__@@"
+    LOG_FORMAT = [
+        # hash
+        "%H",  # commit hash
+        "%h",  # abbreviated commit hash
+        # author
+        "%an",  # author name
+        "%ae",  # author email
+        "%at",  # author date, UNIX timestamp
+        # committer
+        "%cn",  # committer name
+        "%ce",  # committer email
+        "%ct",  # committer date, UNIX timestamp
+        # subject and body
+        "%B",  # raw body (unwrapped subject and body)
+    ]
+
+    def log(self, revision_range: str) -> Iterator[CommitRecordType]:
+        git_log_cmd = [
+            "--no-pager",
+            "log",
+            "--no-decorate",
+            f"--pretty={self.LOG_DELIMITER.join(self.LOG_FORMAT)}{self.LOG_SEPARATOR}",
+            revision_range,
+        ]
+        for commit_string in self._runner.stream(git_log_cmd, f"{self.LOG_SEPARATOR}\n"):
+            yield commit_string.split(self.LOG_DELIMITER)
+
+    def log_paths(self, revision_range: str) -> Iterator[CommitPathsRecordType]:
+        # The names follow each commit, so a marker starts every commit instead of ending it.
+        # "-z" ends each name with NUL and keeps unusual names unquoted.
+        git_log_cmd = [
+            "--no-pager",
+            "log",
+            "--no-decorate",
+            "--name-only",
+            "--no-renames",
+            "-z",
+            f"--pretty=format:{self.LOG_SEPARATOR}"
+            f"{self.LOG_DELIMITER.join(self.LOG_FORMAT)}{self.LOG_DELIMITER}",
+            revision_range,
+        ]
+        records = self._runner.stream(git_log_cmd, self.LOG_SEPARATOR, terminated=False)
+        next(records, None)  # nothing comes before the first marker
+        for commit_string in records:
+            fields = commit_string.split(self.LOG_DELIMITER)
+            names = fields.pop().removeprefix("\n").split("\0")
+            yield fields, [name for name in names if name]
+
+    def log_subjects(self, revision_range: str) -> Iterator[SubjectRecordType]:
+        # "%s" never contains a newline, so one line is one commit.
+        git_log_cmd = ["--no-pager", "log", "--no-decorate", "--format=%H %s", revision_range]
+        for line in self._runner.stream(git_log_cmd, "\n"):
+            sha, _, subject = line.partition(" ")
+            yield sha, subject
+
+    def rev_list(self, revision_range: str) -> Iterator[str]:
+        yield from self._runner.stream(["rev-list", revision_range], "\n")
+
+    def tags(self) -> Iterator[TagRecordType]:
+        delimiter = "\t"
+        fotmat = [
+            "%(objecttype)",
+            "%(objectname)",
+            "%(*objectname)",  # the commit an annotated tag points to
+            "%(refname:short)",
+            "%(creator)",
+        ]
+        git_for_each_ref_cmd = [
+            "for-each-ref",
+            "--sort=-creatordate",
+            f"--format={delimiter.join(fotmat)}",
+            "refs/tags",
+        ]
+        for tag_string in self._run(git_for_each_ref_cmd):
+            yield tag_string.split(delimiter)
+
+    def merged_tags(self, start: Optional[str], end: str) -> list[str]:
+        git_for_each_ref_cmd = [
+            "for-each-ref",
+            f"--merged={end}",
+            "--format=%(refname:short)",
+            "refs/tags",
+        ]
+        if start:
+            git_for_each_ref_cmd.insert(2, f"--no-merged={start}")
+        return self._run(git_for_each_ref_cmd)
+
+    def read_commit(self, rev: str) -> Optional[CommitRecordType]:
+        result = self._runner.cat_file(f"{rev}^{{commit}}")
+        if result is None:
+            return None
+        sha, _, data = result
+        return _commit_record(sha, CommitObject(data))
+
+    def _run(self, args: list[str]) -> list[str]:
+        lines = self._runner.run(args).decode("utf-8").split("\n")
+        lines.pop()
+        return lines
+
+
+class PythonGitBackend(BaseGitBackend):
+    def __init__(self, config: CommitizenConfig, runner: GitRunner) -> None:
+        super().__init__(config, runner)
+        self._repository: Optional[Repository] = None
+
+    @property
+    def repository(self) -> Repository:
+        if self._repository is None:
+            self._repository = Repository(self._config.repository_path)
+        return self._repository
+
+    def log(self, revision_range: str) -> Iterator[CommitRecordType]:
+        for sha, commit in self.repository.walk(revision_range):
+            yield _commit_record(sha, commit)
+
+    def log_paths(self, revision_range: str) -> Iterator[CommitPathsRecordType]:
+        for sha, commit in self.repository.walk(revision_range):
+            yield _commit_record(sha, commit), self.repository.changed_paths(commit)
+
+    def log_subjects(self, revision_range: str) -> Iterator[SubjectRecordType]:
+        for sha, commit in self.repository.walk(revision_range):
+            yield sha, _subject(commit.message)
+
+    def rev_list(self, revision_range: str) -> Iterator[str]:
+        for sha, _ in self.repository.walk(revision_range):
+            yield sha
+
+    def tags(self) -> Iterator[TagRecordType]:
+        records: list[tuple[int, TagRecordType]] = []
+        for name, sha in sorted(self.repository.refs("refs/tags/").items()):
+            object_type, data = self.repository.objects.read(sha)
+            peeled = ""
+            if object_type == "tag":
+                tag = TagObject(data)
+                peeled = self.repository.peel(tag.object)
+                creator = tag.tagger
+            elif object_type == "commit":
+                creator = CommitObject(data).committer
+            else:
+                creator = None
+            records.append(
+                (
+                    creator.unix_time if creator else 0,
+                    [
+                        object_type,
+                        sha,
+                        peeled,
+                        name[len("refs/tags/") :],
+                        creator.raw if creator else "",
+                    ],
+                )
+            )
+        # Newest first like "--sort=-creatordate"; sort is stable, so ties keep name order.
+        records.sort(key=lambda record: -record[0])
+        for _, record in records:
+            yield record
+
+    def merged_tags(self, start: Optional[str], end: str) -> list[str]:
+        revision_range = f"{start}..{end}" if start else end
+        commits = {sha for sha, _ in self.repository.walk(revision_range)}
+        names: list[str] = []
+        for name, sha in self.repository.refs("refs/tags/").items():
+            if self.repository.peel(sha) in commits:
+                names.append(name[len("refs/tags/") :])
+        return names
+
+    def read_commit(self, rev: str) -> Optional[CommitRecordType]:
+        try:
+            sha = self.repository.resolve(rev)
+        except ValueError:
+            return None
+        return _commit_record(sha, self.repository.objects.read_commit(sha))
+
+
+def _commit_record(sha: str, commit: CommitObject) -> CommitRecordType:
+    return [
+        sha,
+        sha[: BaseGitBackend.SHORT_HASH_LENGTH],
+        commit.author.name,
+        commit.author.email,
+        f"{commit.author.unix_time}",
+        commit.committer.name,
+        commit.committer.email,
+        f"{commit.committer.unix_time}",
+        commit.message,
+    ]
+
+
+def _subject(message: str) -> str:
+    # Like git's "%s": the first paragraph, skipping blank lines before it, joined by spaces.
+    lines: list[str] = []
+    for line in message.split("\n"):
+        line = line.rstrip()
+        if line:
+            lines.append(line)
+        elif lines:
+            break
+    return " ".join(lines)
@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import zlib
+from pathlib import Path
+from typing import Optional
+
+from .pack import ObjectType
+from .pack import PackFile
+
+
+class Signature:
+    def __init__(self, line: bytes) -> None:
+        # "Name <email> 1650000000 +0900"
+        name, _, rest = line.partition(b" <")
+        email, _, date = rest.partition(b"> ")
+        self.name = name.decode("utf-8", "replace")
+        self.email = email.decode("utf-8", "replace")
+        self.raw = line.decode("utf-8", "replace")
+        self.unix_time = int(date.split(b" ")[0] or 0)
+
+
+class CommitObject:
+    def __init__(self, data: bytes) -> None:
+        self.parents: list[str] = []
+        headers, _, message = data.partition(b"\n\n")
+        for line in headers.split(b"\n"):
+            key, _, value = line.partition(b" ")
+            if key == b"tree":
+                self.tree = value.decode("ascii")
+            elif key == b"parent":
+                self.parents.append(value.decode("ascii"))
+            elif key == b"author":
+                self.author = Signature(value)
+            elif key == b"committer":
+                self.committer = Signature(value)
+        self.message = message.decode("utf-8", "replace")
+
+
+class TagObject:
+    def __init__(self, data: bytes) -> None:
+        self.tagger: Optional[Signature] = None
+        headers, _, message = data.partition(b"\n\n")
+        for line in headers.split(b"\n"):
+            key, _, value = line.partition(b" ")
+            if key == b"object":
+                self.object = value.decode("ascii")
+            elif key == b"type":
+                self.type = value.decode("ascii")
+            elif key == b"tag":
+                self.name = value.decode("utf-8", "replace")
+            elif key == b"tagger":
+                self.tagger = Signature(value)
+        self.message = message.decode("utf-8", "replace")
+
+
+class TreeObject:
+    DIRECTORY_MODE = "40000"
+
+    def __init__(self, data: bytes) -> None:
+        # "<mode> <name>\0<20 byte object name>" per entry
+        self.entries: dict[str, tuple[str, str]] = {}
+        position = 0
+        while position < len(data):
+            space = data.index(b" ", position)
+            nul = data.index(b"\0", space)
+            mode = data[position:space].decode("ascii")
+            name = data[space + 1 : nul].decode("utf-8", "replace")
+            self.entries[name] = (mode, data[nul + 1 : nul + 21].hex())
+            position = nul + 21
+
+
+class ObjectStore:
+    def __init__(self, objects_path: Path) -> None:
+        self._paths = [objects_path]
+        alternates = Path(f"{objects_path}/info/alternates")
+        if alternates.exists():
+            for line in alternates.read_text().splitlines():
+                if line and not line.startswith("#"):
+                    self._paths.append((objects_path / line).resolve())
+        self._packs: list[PackFile] = []
+        for path in self._paths:
+            for pack_path in sorted(Path(f"{path}/pack").glob("*.pack")):
+                if pack_path.with_suffix(".idx").exists():
+                    self._packs.append(PackFile(pack_path))
+
+    def read(self, sha: str) -> ObjectType:
+        return self._read(bytes.fromhex(sha))
+
+    def _read(self, sha: bytes) -> ObjectType:
+        # Most objects of an old history are packed, so the packs are searched first.
+        for pack in self._packs:
+            offset = pack.index.find(sha)
+            if offset is not None:
+                return pack.read(offset, self._read)
+        hex_sha = sha.hex()
+        for path in self._paths:
+            loose_path = Path(f"{path}/{hex_sha[:2]}/{hex_sha[2:]}")
+            if loose_path.exists():
+                data = zlib.decompress(loose_path.read_bytes())
+                header, _, body = data.partition(b"\0")
+                return header.split(b" ")[0].decode("ascii"), body
+        raise KeyError(hex_sha)
+
+    def read_commit(self, sha: str) -> CommitObject:
+        object_type, data = self.read(sha)
+        if object_type != "commit":
+            raise ValueError(f"{sha} is a {object_type}, not a commit")
+        return CommitObject(data)
+
+    def read_tree(self, sha: str) -> TreeObject:
+        object_type, data = self.read(sha)
+        if object_type != "tree":
+            raise ValueError(f"{sha} is a {object_type}, not a tree")
+        return TreeObject(data)
+
+    def find_prefix(self, prefix: str) -> set[str]:
+        matches: set[str] = set()
+        for path in self._paths:
+            directory = Path(f"{path}/{prefix[:2]}")
+            if directory.is_dir():
+                for loose_path in directory.iterdir():
+                    sha = f"{prefix[:2]}{loose_path.name}"
+                    if sha.startswith(prefix):
+                        matches.add(sha)
+        for pack in self._packs:
+            matches.update(pack.index.find_prefix(prefix))
+        return matches
+
+    def close(self) -> None:
+        for pack in self._packs:
+            pack.close()
+        self._packs = []
@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import mmap
+import struct
+import zlib
+from bisect import bisect_left
+from pathlib import Path
+from typing import Callable
+from typing import Optional
+
+OBJECT_TYPES = {1: "commit", 2: "tree", 3: "blob", 4: "tag"}
+OFS_DELTA = 6
+REF_DELTA = 7
+
+ObjectType = tuple[str, bytes]
+
+
+def _open_mmap(path: Path) -> mmap.mmap:
+    with path.open("rb") as f:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+class PackIndex:
+    MAGIC = b"\377tOc"
+
+    def __init__(self, path: Path) -> None:
+        self._data = _open_mmap(path)
+        if self._data[:4] != self.MAGIC or struct.unpack(">I", self._data[4:8])[0] != 2:
+            raise RuntimeError(f"Unsupported pack index version: {path}")
+        self._fanout = struct.unpack(">256I", self._data[8 : 8 + 256 * 4])
+        self.count = self._fanout[255]
+        self._names_offset = 8 + 256 * 4
+        self._crc_offset = self._names_offset + 20 * self.count
+        self._offsets_offset = self._crc_offset + 4 * self.count
+        self._large_offsets_offset = self._offsets_offset + 4 * self.count
+
+    def _name(self, i: int) -> bytes:
+        start = self._names_offset + 20 * i
+        return self._data[start : start + 20]
+
+    def _offset(self, i: int) -> int:
+        start = self._offsets_offset + 4 * i
+        offset: int = struct.unpack(">I", self._data[start : start + 4])[0]
+        if offset & 0x80000000:
+            start = self._large_offsets_offset + 8 * (offset & 0x7FFFFFFF)
+            offset = struct.unpack(">Q", self._data[start : start + 8])[0]
+        return offset
+
+    def _range(self, first_byte: int) -> tuple[int, int]:
+        low = self._fanout[first_byte - 1] if first_byte else 0
+        return low, self._fanout[first_byte]
+
+    def find(self, sha: bytes) -> Optional[int]:
+        low, high = self._range(sha[0])
+        i = bisect_left(range(low, high), sha, key=self._name) + low
+        if i < high and self._name(i) == sha:
+            return self._offset(i)
+        return None
+
+    def find_prefix(self, prefix: str) -> list[str]:
+        # Pad the odd nibble with zeros so the search starts at the first candidate.
+        low_bound = bytes.fromhex(prefix + "0" * (len(prefix) % 2))
+        low, high = self._range(low_bound[0])
+        i = bisect_left(range(low, high), low_bound, key=self._name) + low
+        matches: list[str] = []
+        while i < high:
+            name = self._name(i).hex()
+            if not name.startswith(prefix):
+                break
+            matches.append(name)
+            i += 1
+        return matches
+
+    def close(self) -> None:
+        self._data.close()
+
+
+class PackFile:
+    BASE_CACHE_SIZE = 256
+
+    def __init__(self, path: Path) -> None:
+        self.index = PackIndex(path.with_suffix(".idx"))
+        self._data = _open_mmap(path)
+        if self._data[:4] != b"PACK":
+            raise RuntimeError(f"Not a pack file: {path}")
+        self._base_cache: dict[int, ObjectType] = {}
+
+    def read(self, offset: int, read_ref: Callable[[bytes], ObjectType]) -> ObjectType:
+        # Walk down the delta chain first, then apply the deltas from the base up.
+        deltas: list[tuple[int, bytes]] = []
+        while True:
+            cached = self._base_cache.get(offset)
+            if cached is not None:
+                base = cached
+                break
+            object_type, size, pos = self._read_header(offset)
+            if object_type == OFS_DELTA:
+                c = self._data[pos]
+                pos += 1
+                distance = c & 0x7F
+                while c & 0x80:
+                    c = self._data[pos]
+                    pos += 1
+                    distance = ((distance + 1) << 7) | (c & 0x7F)
+                deltas.append((offset, self._inflate(pos, size)))
+                offset -= distance
+            elif object_type == REF_DELTA:
+                base_sha = self._data[pos : pos + 20]
+                deltas.append((offset, self._inflate(pos + 20, size)))
+                base = read_ref(base_sha)
+                break
+            else:
+                base = (OBJECT_TYPES[object_type], self._inflate(pos, size))
+                if deltas:
+                    self._cache(offset, base)
+                break
+        for delta_offset, delta in reversed(deltas):
+            base = (base[0], self._apply_delta(base[1], delta))
+            self._cache(delta_offset, base)
+        return base
+
+    def _cache(self, offset: int, obj: ObjectType) -> None:
+        if len(self._base_cache) >= self.BASE_CACHE_SIZE:
+            self._base_cache.pop(next(iter(self._base_cache)))
+        self._base_cache[offset] = obj
+
+    def _read_header(self, offset: int) -> tuple[int, int, int]:
+        c = self._data[offset]
+        pos = offset + 1
+        object_type = (c >> 4) & 0x7
+        size = c & 0x0F
+        shift = 4
+        while c & 0x80:
+            c = self._data[pos]
+            pos += 1
+            size |= (c & 0x7F) << shift
+            shift += 7
+        return object_type, size, pos
+
+    def _inflate(self, pos: int, size: int) -> bytes:
+        decompressor = zlib.decompressobj()
+        chunks: list[bytes] = []
+        step = max(size, 4096)
+        while not decompressor.eof:
+            data = self._data[pos : pos + step]
+            if not data:
+                raise RuntimeError("Truncated pack file.")
+            chunks.append(decompressor.decompress(data))
+            pos += step
+        return b"".join(chunks)
+
+    @staticmethod
+    def _apply_delta(base: bytes, delta: bytes) -> bytes:
+        pos = 0
+        for _ in range(2):  # source size, then target size
+            while delta[pos] & 0x80:
+                pos += 1
+            pos += 1
+        result = bytearray()
+        length = len(delta)
+        while pos < length:
+            opcode = delta[pos]
+            pos += 1
+            if opcode & 0x80:
+                copy_offset = 0
+                copy_size = 0
+                for i in range(4):
+                    if opcode & (1 << i):
+                        copy_offset |= delta[pos] << (8 * i)
+                        pos += 1
+                for i in range(3):
+                    if opcode & (1 << (4 + i)):
+                        copy_size |= delta[pos] << (8 * i)
+                        pos += 1
+                result += base[copy_offset : copy_offset + (copy_size or 0x10000)]
+            elif opcode:
+                result += delta[pos : pos + opcode]
+                pos += opcode
+            else:
+                raise RuntimeError("Invalid delta opcode.")
+        return bytes(result)
+
+    def close(self) -> None:
+        self.index.close()
+        self._data.close()
@@ -0,0 +1,225 @@
+from __future__ import annotations
+
+import heapq
+import re
+from pathlib import Path
+from typing import Iterator
+from typing import Optional
+
+from .objects import CommitObject
+from .objects import ObjectStore
+from .objects import TagObject
+from .objects import TreeObject
+
+
+class Repository:
+    HEX_REGEX = re.compile(r"[0-9a-f]{4,40}")
+    # "<rev>~<n>" and "<rev>^<n>", chained; other revision syntax is not supported.
+    ANCESTRY_REGEX = re.compile(r"(?P<base>.+?)(?P<suffixes>(?:[~^]\d*)+)")
+    ANCESTRY_SUFFIX_REGEX = re.compile(r"([~^])(\d*)")
+    UNSUPPORTED_REVISION_TOKENS = ("@{", "^{", ":", "^!", "^@", "^-")
+    REF_RULES = [
+        "{0}",
+        "refs/{0}",
+        "refs/tags/{0}",
+        "refs/heads/{0}",
+        "refs/remotes/{0}",
+        "refs/remotes/{0}/HEAD",
+    ]
+
+    def __init__(self, path: Path) -> None:
+        git_dir = Path(f"{path}/.git")
+        if git_dir.is_file():
+            # Worktrees and submodules point to their git directory with a "gitdir:" file.
+            git_dir = (path / git_dir.read_text().strip()[len("gitdir: ") :]).resolve()
+        elif not git_dir.exists() and Path(f"{path}/objects").is_dir():
+            git_dir = path
+        self.git_dir = git_dir
+        commondir = Path(f"{git_dir}/commondir")
+        self.common_dir = (
+            (git_dir / commondir.read_text().strip()).resolve() if commondir.exists() else git_dir
+        )
+        self.objects = ObjectStore(Path(f"{self.common_dir}/objects"))
+        self._packed_refs: Optional[dict[str, str]] = None
+        self._shallow: Optional[set[str]] = None
+
+    def close(self) -> None:
+        self.objects.close()
+
+    @property
+    def packed_refs(self) -> dict[str, str]:
+        if self._packed_refs is None:
+            self._packed_refs = {}
+            packed_refs_path = Path(f"{self.common_dir}/packed-refs")
+            if packed_refs_path.exists():
+                for line in packed_refs_path.read_text().splitlines():
+                    if line and line[0] not in "#^":
+                        sha, name = line.split(" ", 1)
+                        self._packed_refs[name] = sha
+        return self._packed_refs
+
+    @property
+    def shallow(self) -> set[str]:
+        # The commits of a shallow clone whose parents were not fetched.
+        if self._shallow is None:
+            shallow_path = Path(f"{self.common_dir}/shallow")
+            self._shallow = set()
+            if shallow_path.exists():
+                self._shallow = set(shallow_path.read_text().split())
+        return self._shallow
+
+    def read_commit(self, sha: str) -> CommitObject:
+        # Commits at the edge of a shallow clone are read as root commits, as git does.
+        commit = self.objects.read_commit(sha)
+        if sha in self.shallow:
+            commit.parents = []
+        return commit
+
+    def read_ref(self, name: str) -> Optional[str]:
+        for _ in range(10):  # the same depth limit git uses for symbolic refs
+            base = self.git_dir if "/" not in name else self.common_dir
+            ref_path = Path(f"{base}/{name}")
+            if ref_path.is_file():
+                value = ref_path.read_text().strip()
+            elif name in self.packed_refs:
+                value = self.packed_refs[name]
+            else:
+                return None
+            if not value.startswith("ref: "):
+                return value
+            name = value[len("ref: ") :]
+        return None
+
+    def refs(self, prefix: str) -> dict[str, str]:
+        result = {name: sha for name, sha in self.packed_refs.items() if name.startswith(prefix)}
+        refs_path = Path(f"{self.common_dir}/{prefix}")
+        if refs_path.is_dir():
+            for ref_path in refs_path.rglob("*"):
+                if ref_path.is_file():
+                    name = ref_path.relative_to(self.common_dir).as_posix()
+                    sha = self.read_ref(name)
+                    if sha:
+                        result[name] = sha
+        return result
+
+    def resolve(self, rev: str) -> str:
+        if any(token in rev for token in self.UNSUPPORTED_REVISION_TOKENS):
+            raise ValueError(f"unsupported revision syntax: {rev}")
+        result = self.ANCESTRY_REGEX.fullmatch(rev)
+        if not result:
+            return self._resolve_name(rev)
+        sha = self._resolve_name(result.group("base"))
+        for kind, number in self.ANCESTRY_SUFFIX_REGEX.findall(result.group("suffixes")):
+            count = int(number) if number else 1
+            if kind == "~":
+                for _ in range(count):
+                    sha = self._parent(sha, 1, rev)
+            elif count:
+                sha = self._parent(sha, count, rev)
+        return sha
+
+    def _parent(self, sha: str, number: int, rev: str) -> str:
+        parents = self.read_commit(sha).parents
+        if len(parents) < number:
+            raise ValueError(f"unknown revision: {rev}")
+        return parents[number - 1]
+
+    def _resolve_name(self, rev: str) -> str:
+        for rule in self.REF_RULES:
+            sha = self.read_ref(rule.format(rev))
+            if sha:
+                return self.peel(sha)
+        if self.HEX_REGEX.fullmatch(rev):
+            matches = {rev} if len(rev) == 40 else self.objects.find_prefix(rev)
+            if len(matches) == 1:
+                return self.peel(matches.pop())
+            if matches:
+                raise ValueError(f"short object ID {rev} is ambiguous")
+        raise ValueError(f"unknown revision: {rev}")
+
+    def peel(self, sha: str) -> str:
+        object_type, data = self.objects.read(sha)
+        while object_type == "tag":
+            sha = TagObject(data).object
+            object_type, data = self.objects.read(sha)
+        return sha
+
+    def walk(self, revision_range: str) -> Iterator[tuple[str, CommitObject]]:
+        start, separator, end = revision_range.rpartition("..")
+        include = [self.resolve(end or "HEAD")]
+        exclude = [self.resolve(start or "HEAD")] if separator else []
+        return self.walk_commits(include, exclude)
+
+    def walk_commits(
+        self, include: list[str], exclude: list[str]
+    ) -> Iterator[tuple[str, CommitObject]]:
+        # Newest committer date first, like "git log". Excluded commits spread their flag
+        # to their parents, and the walk stops once only excluded commits remain queued.
+        uninteresting: set[str] = set()
+        queued: set[str] = set()
+        done: set[str] = set()
+        heap: list[tuple[int, int, str, CommitObject]] = []
+        interesting_count = 0
+
+        def push(sha: str, is_uninteresting: bool) -> None:
+            nonlocal interesting_count
+            if is_uninteresting and sha not in uninteresting:
+                uninteresting.add(sha)
+                if sha in queued and sha not in done:
+                    interesting_count -= 1
+            if sha in queued:
+                return
+            queued.add(sha)
+            commit = self.read_commit(sha)
+            heapq.heappush(heap, (-commit.committer.unix_time, len(queued), sha, commit))
+            if sha not in uninteresting:
+                interesting_count += 1
+
+        for sha in exclude:
+            push(sha, True)
+        for sha in include:
+            push(sha, False)
+        while heap and interesting_count > 0:
+            _, _, sha, commit = heapq.heappop(heap)
+            done.add(sha)
+            is_uninteresting = sha in uninteresting
+            if not is_uninteresting:
+                interesting_count -= 1
+            for parent in commit.parents:
+                push(parent, is_uninteresting)
+            if not is_uninteresting:
+                yield sha, commit
+
+    def changed_paths(self, commit: CommitObject) -> list[str]:
+        # Like "git log --name-only --no-renames": a merge lists nothing and a root commit
+        # lists every file.
+        if len(commit.parents) > 1:
+            return []
+        parent_tree = self.read_commit(commit.parents[0]).tree if commit.parents else None
+        paths: list[str] = []
+        self._diff_trees(parent_tree, commit.tree, "", paths)
+        return paths
+
+    def _diff_trees(
+        self, old_sha: Optional[str], new_sha: Optional[str], prefix: str, paths: list[str]
+    ) -> None:
+        old_entries = self.objects.read_tree(old_sha).entries if old_sha else {}
+        new_entries = self.objects.read_tree(new_sha).entries if new_sha else {}
+        for name in sorted(old_entries.keys() | new_entries.keys()):
+            old_entry = old_entries.get(name)
+            new_entry = new_entries.get(name)
+            if old_entry == new_entry:
+                continue  # equal object names, so the whole subtree is unchanged
+            path = f"{prefix}{name}"
+            old_tree = _tree_sha(old_entry)
+            new_tree = _tree_sha(new_entry)
+            if old_tree or new_tree:
+                self._diff_trees(old_tree, new_tree, f"{path}/", paths)
+            if (old_entry and not old_tree) or (new_entry and not new_tree):
+                paths.append(path)
+
+
+def _tree_sha(entry: Optional[tuple[str, str]]) -> Optional[str]:
+    if entry and entry[0] == TreeObject.DIRECTORY_MODE:
+        return entry[1]
+    return None
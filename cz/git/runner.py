@@ -0,0 +1,219 @@
+from __future__ import annotations
+
+import subprocess
+import threading
+from io import BufferedReader
+from io import BufferedWriter
+from pathlib import Path
+from queue import Queue
+from typing import Iterator
+from typing import Optional
+from typing import cast
+
+from cz.profiling import profiler
+
+# object name, object type, content
+CatFileType = tuple[str, str, bytes]
+# object name, object type, size
+BatchCheckType = tuple[str, str, int]
+
+
+class GitRunner:
+    STREAM_CHUNK_SIZE = 64 * 1024
+
+    def __init__(self, repository_path: Path) -> None:
+        self.repository_path = repository_path
+
+    def run(self, args: list[str], input: Optional[bytes] = None) -> bytes:
+        with profiler.span(f"git {_subcommand(args)}"):
+            completed_cmd = subprocess.run(
+                ["git"] + args,
+                input=input,
+                capture_output=True,
+                check=True,
+                cwd=self.repository_path,
+            )
+        profiler.count("git.bytes_read", len(completed_cmd.stdout))
+        return completed_cmd.stdout
+
+    def stream(self, args: list[str], separator: str, terminated: bool = True) -> Iterator[str]:
+        cmd = ["git"] + args
+        sep = separator.encode("utf-8")
+        # The span lasts as long as the caller consumes the output; ".wait" is the part of
+        # it spent waiting for git.
+        span_name = f"git {_subcommand(args)}"
+        with profiler.span(span_name), subprocess.Popen(
+            cmd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            cwd=self.repository_path,
+        ) as process:
+            stdout = cast(BufferedReader, process.stdout)
+            stderr = cast(BufferedReader, process.stderr)
+            read1 = profiler.wrap(f"{span_name}.wait", stdout.read1)
+            try:
+                buffer = bytearray()
+                while chunk := read1(self.STREAM_CHUNK_SIZE):
+                    profiler.count("git.bytes_read", len(chunk))
+                    # Only the tail of the previous chunk can hold a partial separator.
+                    search_from = max(len(buffer) - len(sep) + 1, 0)
+                    buffer += chunk
+                    start = 0
+                    while (end := buffer.find(sep, search_from)) != -1:
+                        yield buffer[start:end].decode("utf-8")
+                        start = search_from = end + len(sep)
+                    del buffer[:start]
+                errors = stderr.read()
+                if process.wait() != 0:
+                    raise subprocess.CalledProcessError(process.returncode, cmd, stderr=errors)
+                if buffer and not terminated:
+                    yield buffer.decode("utf-8")  # the last record has no separator after it
+                elif buffer:
+                    raise RuntimeError(f"Truncated output from {cmd[:3]}")
+            finally:
+                if process.poll() is None:
+                    process.kill()
+
+    def cat_file(self, rev: str) -> Optional[CatFileType]:
+        info = self.batch_check(rev)
+        if info is None:
+            return None
+        sha, object_type, _ = info
+        return sha, object_type, self.run(["cat-file", object_type, sha])
+
+    def batch_check(self, rev: str) -> Optional[BatchCheckType]:
+        completed_cmd = subprocess.run(
+            ["git", "cat-file", "--batch-check"],
+            input=f"{rev}\n".encode("utf-8"),
+            capture_output=True,
+            check=True,
+            cwd=self.repository_path,
+        )
+        return _parse_batch_header(completed_cmd.stdout.rstrip(b"\n"))
+
+    def close(self) -> None:
+        pass
+
+
+class _BatchProcess:
+    def __init__(self, repository_path: Path, mode: str) -> None:
+        self.mode = mode
+        self.process = subprocess.Popen(
+            ["git", "cat-file", mode],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            cwd=repository_path,
+        )
+        self.stdin = cast(BufferedWriter, self.process.stdin)
+        self.stdout = cast(BufferedReader, self.process.stdout)
+
+    def request(self, rev: str) -> bytes:
+        if "\n" in rev:
+            raise ValueError(f"Invalid revision: {rev!r}")
+        self.stdin.write(f"{rev}\n".encode("utf-8"))
+        self.stdin.flush()
+        line = self.stdout.readline()
+        if not line.endswith(b"\n"):
+            raise RuntimeError(f"Truncated output from git cat-file {self.mode}")
+        return line[:-1]
+
+    def read(self, size: int) -> bytes:
+        data = self.stdout.read(size + 1)  # the content is followed by a newline
+        if len(data) != size + 1:
+            raise RuntimeError(f"Truncated output from git cat-file {self.mode}")
+        return data[:size]
+
+    def close(self) -> None:
+        self.stdin.close()
+        self.process.wait()
+        self.stdout.close()
+
+    def kill(self) -> None:
+        self.process.kill()
+        self.process.wait()
+        try:
+            self.stdin.close()
+        except OSError:
+            pass  # the unflushed part of a request has nowhere to go
+        self.stdout.close()
+
+
+class PersistentGitRunner(GitRunner):
+    POOL_SIZE = 2
+
+    def __init__(self, repository_path: Path) -> None:
+        super().__init__(repository_path)
+        self._lock = threading.Lock()
+        self._pools: dict[str, Queue[_BatchProcess]] = {}
+        self._processes: list[_BatchProcess] = []
+
+    def cat_file(self, rev: str) -> Optional[CatFileType]:
+        process = self._acquire("--batch")
+        try:
+            with profiler.span("git cat-file --batch", is_event=False):
+                info = _parse_batch_header(process.request(rev))
+                data = process.read(info[2]) if info else b""
+        except BaseException:
+            self._discard(process)
+            raise
+        self._pools["--batch"].put(process)
+        if info is None:
+            return None
+        sha, object_type, size = info
+        profiler.count("git.bytes_read", size)
+        return sha, object_type, data
+
+    def batch_check(self, rev: str) -> Optional[BatchCheckType]:
+        process = self._acquire("--batch-check")
+        try:
+            with profiler.span("git cat-file --batch-check", is_event=False):
+                info = _parse_batch_header(process.request(rev))
+        except BaseException:
+            self._discard(process)
+            raise
+        self._pools["--batch-check"].put(process)
+        return info
+
+    def _acquire(self, mode: str) -> _BatchProcess:
+        # Callers on other threads share the warm processes; a new one is only started
+        # while the pool is below POOL_SIZE and every existing one is busy.
+        with self._lock:
+            pool = self._pools.setdefault(mode, Queue())
+            started = sum(1 for process in self._processes if process.mode == mode)
+            if pool.empty() and started < self.POOL_SIZE:
+                process = _BatchProcess(self.repository_path, mode)
+                self._processes.append(process)
+                return process
+        return pool.get()
+
+    def _discard(self, process: _BatchProcess) -> None:
+        # A process interrupted between a request and the end of its reply would answer the
+        # next request with the rest of this one, so it is killed instead of put back. A new
+        # one takes its place for the callers waiting on the pool.
+        process.kill()
+        with self._lock:
+            if process not in self._processes:
+                return  # closed meanwhile
+            self._processes.remove(process)
+            replacement = _BatchProcess(self.repository_path, process.mode)
+            self._processes.append(replacement)
+            self._pools[process.mode].put(replacement)
+
+    def close(self) -> None:
+        with self._lock:
+            for process in self._processes:
+                process.close()
+            self._processes = []
+            self._pools = {}
+
+
+def _subcommand(args: list[str]) -> str:
+    return next((arg for arg in args if not arg.startswith("-")), "")
+
+
+def _parse_batch_header(header: bytes) -> Optional[BatchCheckType]:
+    # "<sha> <type> <size>", or "<rev> missing" / "<rev> ambiguous"
+    fields = header.decode("utf-8").split(" ")
+    if len(fields) != 3:
+        return None
+    return fields[0], fields[1], int(fields[2])
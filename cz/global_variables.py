@@ -12,6 +12,10 @@ if TYPE_CHECKING:
 class GlobalVariables:
     def __init__(self) -> None:
         self.commits: dict[str, ConventionalCommit] = {}
+        # commits newer than the latest version tag
+        self.unreleased_commits: dict[str, ConventionalCommit] = {}
         self.tags: dict[str, Tag] = {}
+        self.commit_tags: dict[str, dict[str, Tag]] = {}
+        self.version_tags: dict[str, list[Tag]] = {}
         self.commit_groups: dict[str, CommitGroup] = {}
         self.version_groups: dict[Tag, VersionGroup] = {}
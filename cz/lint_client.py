@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import socket
+import sys
+from pathlib import Path
+from typing import Any
+from typing import Optional
+
+# Runs as a commit-msg hook, so only the standard library is imported up front. The lint
+# server keeps the config and the parser loaded; without it the message is linted here.
+
+SOCKET_ENV = "CZ_LINT_SOCKET"
+TIMEOUT = 5.0
+
+
+def default_socket_path() -> Path:
+    if SOCKET_ENV in os.environ:
+        return Path(os.environ[SOCKET_ENV])
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if not runtime_dir:
+        runtime_dir = f"{os.environ.get('TMPDIR', '/tmp')}/cz-{os.getuid()}"
+    return Path(f"{runtime_dir}/cz-lint.sock")
+
+
+def request(socket_path: Path, repository_path: Path, message: str) -> dict[str, Any]:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.settimeout(TIMEOUT)
+        client.connect(f"{socket_path}")
+        data = {"repository_path": f"{repository_path}", "message": message}
+        client.sendall(json.dumps(data).encode("utf-8") + b"\n")
+        client.shutdown(socket.SHUT_WR)
+        with client.makefile("rb") as reader:
+            line = reader.readline()
+    if not line:
+        raise ConnectionError("The lint server closed the connection.")
+    response: dict[str, Any] = json.loads(line)
+    return response
+
+
+def lint_in_process(repository_path: Path, message: str) -> dict[str, Any]:
+    from cz.config import CommitizenConfig
+    from cz.exceptions import InvalidCommitMessageError
+
+    try:
+        CommitizenConfig.load(repository_path).message_parser.parse(message)
+    except InvalidCommitMessageError as e:
+        return {"ok": False, "rule": e.rule, "line": e.line, "message": f"{e}"}
+    return {"ok": True}
+
+
+def spawn_server(socket_path: Path) -> None:
+    import subprocess
+
+    subprocess.Popen(
+        [sys.executable, "-m", "cz", "lint-server", f"--socket={socket_path}"],
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="cz-lint", description="Lint a commit message file through the cz lint server."
+    )
+    parser.add_argument("commit_msg_file")
+    parser.add_argument("-r", "--repository-path", default=".")
+    parser.add_argument("--socket", default=None)
+    parser.add_argument(
+        "--spawn", action="store_true", help="start the lint server if it is not running"
+    )
+    args = parser.parse_args(argv)
+    message = Path(args.commit_msg_file).read_text()
+    repository_path = Path(args.repository_path).resolve()
+    socket_path = Path(args.socket) if args.socket else default_socket_path()
+    try:
+        response = request(socket_path, repository_path, message)
+    except (OSError, ValueError):
+        if args.spawn:
+            spawn_server(socket_path)
+        response = lint_in_process(repository_path, message)
+    if not response["ok"]:
+        sys.stderr.write(f"{response['message']}\n")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import json
+import os
+import socket
+import socketserver
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+from cz.config import CommitizenConfig
+from cz.exceptions import InvalidCommitMessageError
+
+ConfigKeyType = tuple[int, int]
+
+
+class LintRequestHandler(socketserver.StreamRequestHandler):
+    server: LintServer
+
+    def handle(self) -> None:
+        for line in self.rfile:
+            self.server.touch()
+            try:
+                data = json.loads(line)
+                response = self.server.lint(Path(data["repository_path"]), data["message"])
+            except Exception as e:
+                response = {"ok": False, "rule": "error", "line": None, "message": f"{e}"}
+            self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+
+
+class LintServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, socket_path: Path) -> None:
+        self.socket_path = socket_path
+        self._configs: dict[Path, tuple[ConfigKeyType, CommitizenConfig]] = {}
+        self._lock = threading.Lock()
+        self._last_request = time.monotonic()
+        self._prepare_socket_path()
+        # Each request makes the server exec the repository's config, so only the owner
+        # may connect.
+        umask = os.umask(0o177)
+        try:
+            super().__init__(f"{socket_path}", LintRequestHandler)
+        finally:
+            os.umask(umask)
+
+    def _prepare_socket_path(self) -> None:
+        directory = self.socket_path.parent
+        directory.mkdir(mode=0o700, parents=True, exist_ok=True)
+        if directory.stat().st_uid != os.getuid():
+            raise RuntimeError(f"{directory} is owned by another user.")
+        if self.socket_path.exists():
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+                try:
+                    client.connect(f"{self.socket_path}")
+                except OSError:
+                    self.socket_path.unlink()  # left behind by a server that died
+                else:
+                    raise RuntimeError(f"A lint server already listens on {self.socket_path}")
+
+    def touch(self) -> None:
+        self._last_request = time.monotonic()
+
+    def get_config(self, repository_path: Path) -> CommitizenConfig:
+        # The config is loaded again whenever .cz/config.py is rewritten.
+        stat = Path(f"{repository_path}/.cz/config.py").stat()
+        key = (stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            cached = self._configs.get(repository_path)
+        if cached and cached[0] == key:
+            return cached[1]
+        config = CommitizenConfig.load(repository_path)
+        with self._lock:
+            self._configs[repository_path] = (key, config)
+        return config
+
+    def lint(self, repository_path: Path, message: str) -> dict[str, Any]:
+        try:
+            self.get_config(repository_path).message_parser.parse(message)
+        except InvalidCommitMessageError as e:
+            return {"ok": False, "rule": e.rule, "line": e.line, "message": f"{e}"}
+        return {"ok": True}
+
+    def serve(self, idle_timeout: float = 0) -> None:
+        if idle_timeout <= 0:
+            self.serve_forever()
+            return
+        self.timeout = min(idle_timeout, 1.0)
+        while time.monotonic() - self._last_request < idle_timeout:
+            self.handle_request()
+
+    def server_close(self) -> None:
+        super().server_close()
+        self.socket_path.unlink(missing_ok=True)
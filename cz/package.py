@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+from typing import Callable
+from typing import Optional
+
+from .defaults import init_package_version_files
+
+if TYPE_CHECKING:
+    from semver.version import Version
+
+    from cz.config import CommitizenConfig
+    from cz.versioning import BaseVersionFile
+
+    FormatTagFunc = Callable[[Version], str]
+    InitPackageVersionFilesFunc = Callable[[CommitizenConfig, "Package"], list[BaseVersionFile]]
+
+# Formatted in place of a real version to find where a tag format puts the version.
+SENTINEL_VERSION = "9876.5432.1098"
+
+
+class Package:
+    def __init__(self, name: str, path: str) -> None:
+        self.name = name
+        # relative to the repository root, "" for the whole repository
+        self.path = path.strip("/")
+        self.init_version_files_fn: InitPackageVersionFilesFunc = init_package_version_files
+        self.format_tag_fn: Optional[FormatTagFunc] = None
+        self.changelog_template_name: Optional[str] = None
+        self.changelog_file_name = "CHANGELOG.md"
+        self._tag_affixes: Optional[tuple[str, str]] = None
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__}: {self.name}>"
+
+    def set_init_version_files_fn(self, fn: InitPackageVersionFilesFunc) -> None:
+        self.init_version_files_fn = fn
+
+    def set_format_tag_fn(self, fn: FormatTagFunc) -> None:
+        self.format_tag_fn = fn
+        self._tag_affixes = None
+
+    def set_changelog_template_name(self, name: str) -> None:
+        # a template in .cz next to CHANGELOG.j2
+        self.changelog_template_name = name
+
+    def set_changelog_file_name(self, name: str) -> None:
+        self.changelog_file_name = name
+
+    def format_tag(self, version: Version) -> str:
+        if self.format_tag_fn:
+            return self.format_tag_fn(version)
+        return f"{self.name}@{version}"
+
+    def parse_tag(self, tag_name: str) -> Optional[str]:
+        from semver.version import Version
+
+        # Only the function that formats a tag is configured, so it is inverted by cutting
+        # the text around the sentinel version out of the tag name.
+        if self._tag_affixes is None:
+            formatted = self.format_tag(Version.parse(SENTINEL_VERSION))
+            prefix, separator, suffix = formatted.partition(SENTINEL_VERSION)
+            if not separator:
+                raise ValueError(f"The tag format of {self.name} does not contain the version.")
+            self._tag_affixes = prefix, suffix
+        prefix, suffix = self._tag_affixes
+        if len(tag_name) <= len(prefix) + len(suffix):
+            return None
+        if not (tag_name.startswith(prefix) and tag_name.endswith(suffix)):
+            return None
+        version = tag_name[len(prefix) : len(tag_name) - len(suffix)]
+        return version if Version.isvalid(version) else None
@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+import functools
+import os
+import threading
+import time
+from contextlib import AbstractContextManager
+from contextlib import nullcontext
+from pathlib import Path
+from typing import Any
+from typing import Callable
+from typing import TypeVar
+
+ReturnType = TypeVar("ReturnType")
+
+PROFILE_MODES = "summary, trace:<file> or cprofile[:<file>]"
+
+_NULL_SPAN: AbstractContextManager[None] = nullcontext()
+
+
+class _Span:
+    __slots__ = ("_profiler", "_name", "_is_event", "_start")
+
+    def __init__(self, profiler: Profiler, name: str, is_event: bool) -> None:
+        self._profiler = profiler
+        self._name = name
+        self._is_event = is_event
+        self._start = 0
+
+    def __enter__(self) -> None:
+        self._start = time.perf_counter_ns()
+
+    def __exit__(self, *exc_info: object) -> None:
+        self._profiler.add(self._name, self._start, time.perf_counter_ns(), self._is_event)
+
+
+class Profiler:
+    # Every span is summed up per name. Spans that are not per commit also become events of
+    # the trace, up to MAX_EVENTS. While disabled, span() hands out one shared no-op.
+    MAX_EVENTS = 100_000
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self.origin = time.perf_counter_ns()
+        # name, start, end (ns), thread
+        self.events: list[tuple[str, int, int, int]] = []
+        # name -> [calls, total ns]
+        self.totals: dict[str, list[int]] = {}
+        self.counters: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def enable(self) -> None:
+        self.enabled = True
+        self.origin = time.perf_counter_ns()
+
+    def span(self, name: str, is_event: bool = True) -> AbstractContextManager[None]:
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name, is_event)
+
+    def wrap(self, name: str, fn: Callable[..., ReturnType]) -> Callable[..., ReturnType]:
+        # For functions called once per commit: only the total is kept.
+        if not self.enabled:
+            return fn
+
+        def wrapper(*args: Any, **kwargs: Any) -> ReturnType:
+            start = time.perf_counter_ns()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self.add(name, start, time.perf_counter_ns(), False)
+
+        return wrapper
+
+    def traced(self, name: str) -> Callable[[Callable[..., ReturnType]], Callable[..., ReturnType]]:
+        # A decorator for stages; it checks whether profiling is on at every call.
+        def decorator(fn: Callable[..., ReturnType]) -> Callable[..., ReturnType]:
+            @functools.wraps(fn)
+            def wrapper(*args: Any, **kwargs: Any) -> ReturnType:
+                if not self.enabled:
+                    return fn(*args, **kwargs)
+                with _Span(self, name, True):
+                    return fn(*args, **kwargs)
+
+            return wrapper
+
+        return decorator
+
+    def add(self, name: str, start: int, end: int, is_event: bool = True) -> None:
+        with self._lock:
+            total = self.totals.setdefault(name, [0, 0])
+            total[0] += 1
+            total[1] += end - start
+            if is_event and len(self.events) < self.MAX_EVENTS:
+                self.events.append((name, start, end, threading.get_ident()))
+
+    def count(self, name: str, value: int = 1) -> None:
+        if self.enabled:
+            with self._lock:
+                self.counters[name] = self.counters.get(name, 0) + value
+
+    def summary(self) -> list[str]:
+        lines = [f"{'span':<28}{'calls':>10}{'total ms':>12}{'mean ms':>12}"]
+        for name, (calls, total) in sorted(self.totals.items(), key=lambda item: -item[1][1]):
+            lines.append(f"{name:<28}{calls:>10}{total / 1e6:>12.1f}{total / calls / 1e6:>12.3f}")
+        if self.counters:
+            lines.append(f"{'counter':<28}{'value':>10}")
+            for name, value in sorted(self.counters.items()):
+                lines.append(f"{name:<28}{value:>10}")
+        return lines
+
+    def to_trace(self) -> dict[str, Any]:
+        # Chrome trace event format, viewable in chrome://tracing or Perfetto.
+        pid = os.getpid()
+        trace_events: list[dict[str, Any]] = [
+            {
+                "name": name,
+                "ph": "X",
+                "ts": (start - self.origin) / 1000,
+                "dur": (end - start) / 1000,
+                "pid": pid,
+                "tid": tid,
+            }
+            for name, start, end, tid in self.events
+        ]
+        end = max((event[2] for event in self.events), default=self.origin)
+        for name, value in self.counters.items():
+            trace_events.append(
+                {
+                    "name": name,
+                    "ph": "C",
+                    "ts": (end - self.origin) / 1000,
+                    "pid": pid,
+                    "args": {"value": value},
+                }
+            )
+        totals = {
+            name: {"calls": calls, "total_ms": total / 1e6}
+            for name, (calls, total) in self.totals.items()
+        }
+        return {
+            "traceEvents": trace_events,
+            "displayTimeUnit": "ms",
+            "otherData": {"totals": totals, "counters": self.counters},
+        }
+
+
+profiler = Profiler()
+
+
+def run_profiled(mode: str, run: Callable[[], int], write_line: Callable[[str], None]) -> int:
+    kind, _, path = mode.partition(":")
+    if kind == "cprofile":
+        import cProfile
+        import io
+        import pstats
+
+        cprofile = cProfile.Profile()
+        try:
+            return cprofile.runcall(run)
+        finally:
+            if path:
+                cprofile.dump_stats(path)
+            else:
+                stream = io.StringIO()
+                pstats.Stats(cprofile, stream=stream).sort_stats("cumulative").print_stats(30)
+                for line in stream.getvalue().splitlines():
+                    write_line(line)
+    if kind not in ("summary", "trace") or (kind == "trace") != bool(path):
+        raise ValueError(f"Unknown profile mode: {mode} (use {PROFILE_MODES})")
+    profiler.enable()
+    try:
+        with profiler.span("command"):
+            return run()
+    finally:
+        if kind == "trace":
+            import json
+
+            Path(path).write_text(json.dumps(profiler.to_trace()))
+        else:
+            for line in profiler.summary():
+                write_line(line)
@@ -1,5 +1,17 @@
 from .attributes import VersionAttributes
 from .files import BaseVersionFile
+from .files import SpanVersionFile
 from .files import VersionFiles
+from .formats import JSONVersionFile
+from .formats import RegexVersionFile
+from .formats import TOMLVersionFile
 
-__all__ = ["VersionAttributes", "BaseVersionFile", "VersionFiles"]
+__all__ = [
+    "VersionAttributes",
+    "BaseVersionFile",
+    "SpanVersionFile",
+    "VersionFiles",
+    "JSONVersionFile",
+    "RegexVersionFile",
+    "TOMLVersionFile",
+]
@@ -1,8 +1,22 @@
+from __future__ import annotations
+
+import os
+import tempfile
 from abc import ABC
 from abc import abstractmethod
 from pathlib import Path
+from typing import TYPE_CHECKING
+from typing import Callable
+from typing import Optional
+from typing import TypeVar
+from typing import Union
+from typing import cast
+
+if TYPE_CHECKING:
+    from semver.version import Version
 
-from semver.version import Version
+InputType = TypeVar("InputType")
+OutputType = TypeVar("OutputType")
 
 
 class BaseVersionFile(ABC):
@@ -25,24 +39,159 @@ class BaseVersionFile(ABC):
         pass
 
 
+class SpanVersionFile(BaseVersionFile):
+    # The file is read once and the span of the version is found once; saving replaces only
+    # that span, so the rest of the file is written back byte for byte. Reading waits for
+    # the first use, which lets VersionFiles read many files at once.
+    def __init__(self, path: Path) -> None:
+        self.PATH = path
+        self._is_loaded = False
+        self._text = ""
+        self._start = self._end = 0
+        self._version = ""
+        # text and end of the span before the last commit, for rollback
+        self._previous: Optional[tuple[str, int]] = None
+
+    @abstractmethod
+    def find_span(self, text: str) -> tuple[int, int]:
+        pass
+
+    def load(self) -> None:
+        if not self._is_loaded:
+            text = self.PATH.read_bytes().decode("utf-8")
+            self._start, self._end = self.find_span(text)
+            self._text = text
+            self._version = text[self._start : self._end]
+            self._is_loaded = True
+
+    def get_path(self) -> Path:
+        return self.PATH
+
+    def get_version(self) -> str:
+        self.load()
+        return self._version
+
+    def set_version(self, version: str) -> None:
+        self.load()
+        self._version = version
+
+    def save(self) -> None:
+        self.commit(self.stage())
+
+    def stage(self) -> str:
+        # Writes the new content to a temporary file next to this one; commit moves it in.
+        self.load()
+        text = f"{self._text[: self._start]}{self._version}{self._text[self._end :]}"
+        return write_temporary(self.PATH, text.encode("utf-8"))
+
+    def commit(self, temp_name: str) -> None:
+        os.replace(temp_name, self.PATH)
+        self._previous = self._text, self._end
+        self._text = f"{self._text[: self._start]}{self._version}{self._text[self._end :]}"
+        self._end = self._start + len(self._version)
+
+    def rollback(self) -> None:
+        if self._previous is None:
+            return
+        text, end = self._previous
+        os.replace(write_temporary(self.PATH, text.encode("utf-8")), self.PATH)
+        self._text, self._end = text, end
+        self._version = text[self._start : end]
+        self._previous = None
+
+
+def write_temporary(path: Path, data: bytes) -> str:
+    # A temporary file in the same directory, so that os.replace can swap it in atomically.
+    fd, temp_name = tempfile.mkstemp(prefix=f".{path.name}.", dir=path.parent)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.chmod(temp_name, path.stat().st_mode)
+    except BaseException:
+        Path(temp_name).unlink(missing_ok=True)
+        raise
+    return temp_name
+
+
 class VersionFiles:
+    # Files are read and staged on a thread pool. Files that are SpanVersionFiles are
+    # renamed into place only once every one of them is staged, and put back if a later
+    # one fails; other files are saved last and cannot be put back.
+    MAX_WORKERS = 16
+
     def __init__(self, files: list[BaseVersionFile]) -> None:
         self.version_files = files
 
     def get_version(self) -> Version:
-        version = self.validate(self.version_files[0])
-        for version_file in self.version_files[1:]:
-            if version != self.validate(version_file):
+        versions = self._map(self.validate, self.version_files)
+        for version in versions[1:]:
+            if version != versions[0]:
                 raise RuntimeError()
-        return version
+        return versions[0]
 
     def validate(self, version_file: BaseVersionFile) -> Version:
+        from semver.version import Version
+
         version_string = version_file.get_version()
         if not Version.isvalid(version_string):
             raise RuntimeError(f"not version format [{version_file.__class__.__name__}]")
         return Version.parse(version_string)
 
     def set_version(self, version: Version) -> None:
+        span_files: list[SpanVersionFile] = []
+        other_files: list[BaseVersionFile] = []
         for version_file in self.version_files:
             version_file.set_version(f"{version}")
-            version_file.save()
+            if isinstance(version_file, SpanVersionFile):
+                span_files.append(version_file)
+            else:
+                other_files.append(version_file)
+        temp_names = self._stage(span_files)
+        committed: list[SpanVersionFile] = []
+        try:
+            for version_file, temp_name in zip(span_files, temp_names):
+                version_file.commit(temp_name)
+                committed.append(version_file)
+            for other_file in other_files:
+                other_file.save()
+        except BaseException:
+            for temp_name in temp_names[len(committed) :]:
+                Path(temp_name).unlink(missing_ok=True)
+            for version_file in reversed(committed):
+                version_file.rollback()
+            raise
+
+    def rollback(self) -> None:
+        # Puts back what the last set_version wrote, for a step after it that fails.
+        for version_file in reversed(self.version_files):
+            if isinstance(version_file, SpanVersionFile):
+                version_file.rollback()
+
+    def _stage(self, span_files: list[SpanVersionFile]) -> list[str]:
+        # Every file is staged even after a failure, so that all the temporary files that
+        # were written are known and removed.
+        outcomes = self._map(_try_stage, span_files)
+        errors = [outcome for outcome in outcomes if isinstance(outcome, BaseException)]
+        if errors:
+            for outcome in outcomes:
+                if isinstance(outcome, str):
+                    Path(outcome).unlink(missing_ok=True)
+            raise errors[0]
+        return cast(list[str], outcomes)
+
+    def _map(
+        self, fn: Callable[[InputType], OutputType], items: list[InputType]
+    ) -> list[OutputType]:
+        if len(items) < 2:
+            return [fn(item) for item in items]
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(min(self.MAX_WORKERS, len(items))) as executor:
+            return list(executor.map(fn, items))
+
+
+def _try_stage(version_file: SpanVersionFile) -> Union[str, BaseException]:
+    try:
+        return version_file.stage()
+    except BaseException as e:
+        return e
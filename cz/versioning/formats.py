@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import re
+from pathlib import Path
+from typing import Any
+from typing import Optional
+from typing import Union
+
+from .files import SpanVersionFile
+
+
+class TOMLVersionFile(SpanVersionFile):
+    # Tables and "key = value" lines are matched line by line; the result is checked against
+    # a full parse, so a file the scan cannot follow is an error instead of a wrong patch.
+    TABLE_REGEX = re.compile(r"\[(?P<table>[^\[\]]+)\]\s*(?:#.*)?")
+    KEY_VALUE_REGEX = re.compile(
+        r"(?P<key>[\w\-.\"' ]+?)\s*=\s*(?P<quote>[\"'])(?P<value>[^\"'\\\n]*)(?P=quote)\s*(?:#.*)?"
+    )
+    MULTILINE_QUOTES = ('"""', "'''")
+
+    def __init__(self, path: Path, keys: tuple[str, ...]) -> None:
+        self.keys = keys
+        self.document: dict[str, Any] = {}
+        super().__init__(path)
+
+    def find_span(self, text: str) -> tuple[int, int]:
+        import tomllib
+
+        span: Optional[tuple[int, int]] = None
+        # None inside an array of tables, which the keys cannot point into
+        table: Optional[tuple[str, ...]] = ()
+        multiline_quote: Optional[str] = None
+        offset = 0
+        for line in text.split("\n"):
+            line_start = offset
+            offset += len(line) + 1
+            if multiline_quote:
+                if line.count(multiline_quote) % 2:
+                    multiline_quote = None
+                continue
+            multiline_quote = next(
+                (quote for quote in self.MULTILINE_QUOTES if line.count(quote) % 2), None
+            )
+            stripped = line.strip()
+            if multiline_quote or not stripped or stripped.startswith("#"):
+                continue
+            if stripped.startswith("[["):
+                table = None
+            elif result := self.TABLE_REGEX.fullmatch(stripped):
+                table = _split_key(result.group("table"))
+            elif (result := self.KEY_VALUE_REGEX.fullmatch(stripped)) and table is not None:
+                if table + _split_key(result.group("key")) == self.keys:
+                    indent = line_start + len(line) - len(line.lstrip())
+                    span = indent + result.start("value"), indent + result.end("value")
+                    break
+        try:
+            self.document = tomllib.loads(text)
+        except tomllib.TOMLDecodeError as e:
+            # A key defined twice is a decode error too.
+            raise RuntimeError(f"{self.PATH} is not valid TOML: {e}") from e
+        value: Any = self.document
+        for key in self.keys:
+            value = value.get(key) if isinstance(value, dict) else None
+        if span is None or value != text[span[0] : span[1]]:
+            raise RuntimeError(f"{'.'.join(self.keys)} is not a plain string in {self.PATH}")
+        return span
+
+
+class JSONVersionFile(SpanVersionFile):
+    # Objects are followed along the keys and every other value is skipped by the decoder.
+    WHITESPACE_REGEX = re.compile(r"[ \t\n\r]*")
+
+    def __init__(self, path: Path, keys: tuple[str, ...] = ("version",)) -> None:
+        self.keys = keys
+        super().__init__(path)
+
+    def find_span(self, text: str) -> tuple[int, int]:
+        import json
+
+        decoder = json.JSONDecoder()
+        try:
+            position = self._skip(text, 0)
+            for key in self.keys:
+                if text[position] != "{":
+                    raise ValueError(f"{key} is not in an object")
+                position = self._skip(text, position + 1)
+                while True:
+                    if text[position] != '"':
+                        raise ValueError(f"{key} is missing")
+                    name, position = decoder.raw_decode(text, position)
+                    position = self._skip(text, position)
+                    if text[position] != ":":
+                        raise ValueError(f"':' is missing after {name}")
+                    position = self._skip(text, position + 1)
+                    if name == key:
+                        break
+                    position = self._skip(text, decoder.raw_decode(text, position)[1])
+                    if text[position] == ",":
+                        position = self._skip(text, position + 1)
+            value, end = decoder.raw_decode(text, position)
+            # A version written with escapes cannot be patched as it is.
+            if not isinstance(value, str) or text[position + 1 : end - 1] != value:
+                raise ValueError(f"{'.'.join(self.keys)} is not a plain string")
+            # Duplicate keys resolve to the last one, so the whole document has to agree.
+            document: Any = json.loads(text)
+            for key in self.keys:
+                document = document[key]
+            if document != value:
+                raise ValueError(f"{'.'.join(self.keys)} is defined more than once")
+        except (ValueError, IndexError, KeyError, TypeError) as e:
+            raise RuntimeError(f"{e} in {self.PATH}") from e
+        return position + 1, end - 1
+
+    def _skip(self, text: str, position: int) -> int:
+        result = self.WHITESPACE_REGEX.match(text, position)
+        return result.end() if result else position
+
+
+class RegexVersionFile(SpanVersionFile):
+    # The only match of the pattern is patched; its "version" group is the version.
+    def __init__(self, path: Path, pattern: Union[str, re.Pattern[str]]) -> None:
+        self.pattern = re.compile(pattern, re.MULTILINE) if isinstance(pattern, str) else pattern
+        if "version" not in self.pattern.groupindex:
+            raise ValueError(f"{self.pattern.pattern} has no version group")
+        super().__init__(path)
+
+    def find_span(self, text: str) -> tuple[int, int]:
+        result = self.pattern.search(text)
+        if not result:
+            raise RuntimeError(f"{self.pattern.pattern} does not match {self.PATH}")
+        # Patching only the first of several matches would leave the others stale.
+        if self.pattern.search(text, max(result.end(), result.start() + 1)):
+            raise RuntimeError(f"{self.pattern.pattern} matches {self.PATH} more than once")
+        return result.span("version")
+
+
+def _split_key(key: str) -> tuple[str, ...]:
+    # Quoted keys containing "." are not supported.
+    return tuple(part.strip().strip("\"'") for part in key.split("."))
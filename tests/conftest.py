@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import subprocess
+from pathlib import Path
+from typing import Callable
+
+import pytest
+
+CONFIG = """\
+from cz.config import CommitizenConfig
+from cz.defaults import BreakingChangeFooter
+from cz.defaults import ClosesFooter
+from cz.versioning import VersionAttributes
+
+config = CommitizenConfig()
+config.git_backend = "{git_backend}"
+feat = config.create_comit_type("feat")
+fix = config.create_comit_type("fix")
+config.add_title(feat, "Features")
+config.add_title(fix, "Bug Fixes")
+config.add_increment(feat, VersionAttributes.MINOR)
+config.add_increment(fix, VersionAttributes.PATCH)
+config.add_footer_class(BreakingChangeFooter)
+config.add_footer_class(ClosesFooter)
+"""
+
+GitFunc = Callable[..., str]
+
+
+@pytest.fixture
+def git(tmp_path: Path) -> GitFunc:
+    def run(*args: str) -> str:
+        return subprocess.run(
+            ["git", *args], cwd=tmp_path, check=True, capture_output=True, text=True
+        ).stdout
+
+    run("init", "-q", "-b", "main")
+    run("config", "user.name", "Tester")
+    run("config", "user.email", "tester@example.com")
+    return run
+
+
+@pytest.fixture(params=["subprocess", "python"])
+def repository(request: pytest.FixtureRequest, tmp_path: Path, git: GitFunc) -> Path:
+    Path(f"{tmp_path}/.cz").mkdir()
+    Path(f"{tmp_path}/.cz/config.py").write_text(CONFIG.format(git_backend=request.param))
+    return tmp_path
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from cz.api.cz import CommitizenAPI
+from cz.config import CommitizenConfig
+
+from .conftest import GitFunc
+
+PACKAGES = """
+config.create_package("alpha", "packages/alpha")
+config.create_package("beta", "packages/beta")
+"""
+
+
+def _set_version(repository: Path, name: str, version: str) -> None:
+    package_path = Path(f"{repository}/packages/{name}")
+    Path(f"{package_path}/{name}").mkdir(parents=True, exist_ok=True)
+    Path(f"{package_path}/pyproject.toml").write_text(
+        f'[tool.poetry]\nname = "{name}"\nversion = "{version}"\n'
+    )
+    Path(f"{package_path}/{name}/__version__.py").write_text(f'__version__ = "{version}"\n')
+
+
+def _change(repository: Path, git: GitFunc, path: str, message: str) -> None:
+    Path(f"{repository}/{path}").parent.mkdir(parents=True, exist_ok=True)
+    with Path(f"{repository}/{path}").open("a") as f:
+        f.write("change\n")
+    git("add", "-A")
+    git("commit", "-q", "-m", message)
+
+
+def _bump_packages(repository: Path) -> dict[str, tuple[str, str]]:
+    api = CommitizenAPI(CommitizenConfig.load(repository))
+    try:
+        return {
+            name: (f"{current_version}", f"{next_version}")
+            for name, (current_version, next_version) in api.bump_packages().items()
+        }
+    finally:
+        api.close()
+
+
+@pytest.fixture
+def monorepo(repository: Path, git: GitFunc) -> Path:
+    with Path(f"{repository}/.cz/config.py").open("a") as f:
+        f.write(PACKAGES)
+    _set_version(repository, "alpha", "1.0.0")
+    _set_version(repository, "beta", "0.1.0")
+    # Older than every current tag, so the bump never reads it.
+    _change(repository, git, "packages/alpha/a.py", "not a conventional commit")
+    git("tag", "alpha@1.0.0")
+    _change(repository, git, "packages/beta/b.py", "feat: beta before its tag")
+    git("tag", "beta@0.1.0")
+    return repository
+
+
+def test_bump_unreleased_commits(monorepo: Path, git: GitFunc) -> None:
+    _change(monorepo, git, "packages/alpha/a.py", "fix: alpha")
+    _change(monorepo, git, "README", "feat: no package")
+    assert _bump_packages(monorepo) == {"alpha": ("1.0.0", "1.0.1"), "beta": ("0.1.0", "None")}
+    _change(monorepo, git, "packages/beta/b.py", "feat: beta")
+    assert _bump_packages(monorepo) == {"alpha": ("1.0.1", "None"), "beta": ("0.1.0", "0.2.0")}
+    assert "alpha@1.0.1" in git("tag")
+    assert "beta@0.2.0" in git("tag")
+
+
+def test_newer_tag_than_current_version(monorepo: Path, git: GitFunc) -> None:
+    _change(monorepo, git, "packages/beta/b.py", "fix: beta")
+    git("tag", "beta@0.1.1")
+    _change(monorepo, git, "packages/beta/b.py", "fix: beta again")
+    with pytest.raises(RuntimeError, match="not its latest tag"):
+        _bump_packages(monorepo)
+
+
+def test_untagged_current_version(monorepo: Path, git: GitFunc) -> None:
+    _set_version(monorepo, "beta", "0.3.0")
+    with pytest.raises(RuntimeError, match="is not tagged"):
+        _bump_packages(monorepo)
@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from cz.api.cz import CommitizenAPI
+from cz.config import CommitizenConfig
+from cz.exceptions import InvalidCommitMessageError
+
+from .conftest import GitFunc
+
+
+def test_failed_lazy_parse_is_not_cached(repository: Path, git: GitFunc) -> None:
+    git("commit", "-q", "--allow-empty", "-m", "feat: no blank line\nbody")
+    git("commit", "-q", "--allow-empty", "-m", "fix: valid")
+
+    api = CommitizenAPI(CommitizenConfig.load(repository))
+    try:
+        records = api.cc._iter_commits("HEAD", strict=False)
+        with pytest.raises(InvalidCommitMessageError):
+            for _, message in records:
+                message.footer
+        # the parse failed, so the message is still unparsed and keeps raising
+        assert not message.is_parsed
+        with pytest.raises(InvalidCommitMessageError):
+            message.body
+        # dropping the walk runs its finally block, which closes the commit cache
+        del records
+    finally:
+        api.close()
+
+    api = CommitizenAPI(CommitizenConfig.load(repository))
+    try:
+        with pytest.raises(InvalidCommitMessageError):
+            api.cc.get_commits()
+    finally:
+        api.close()
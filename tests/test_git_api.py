@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from cz.api.git import GitAPI
+from cz.config import CommitizenConfig
+
+from .conftest import CONFIG
+from .conftest import GitFunc
+
+
+def test_commit_and_tag_below_the_top(tmp_path: Path, git: GitFunc) -> None:
+    # The config is in a subdirectory of the work tree.
+    Path(f"{tmp_path}/sub/.cz").mkdir(parents=True)
+    Path(f"{tmp_path}/sub/.cz/config.py").write_text(CONFIG.format(git_backend="subprocess"))
+    Path(f"{tmp_path}/sub/pkg").mkdir()
+    for path in ("sub/VERSION", "sub/pkg/VERSION"):
+        Path(f"{tmp_path}/{path}").write_text("1.0.0\n")
+    git("add", "-A")
+    git("commit", "-q", "-m", "chore: init")
+    for path in ("sub/VERSION", "sub/pkg/VERSION"):
+        Path(f"{tmp_path}/{path}").write_text("1.1.0\n")
+
+    config = CommitizenConfig.load(Path(f"{tmp_path}/sub"))
+    git_api = GitAPI(config)
+    try:
+        git_api.commit_and_tag(
+            [Path(f"{tmp_path}/sub/VERSION"), Path(f"{tmp_path}/sub/pkg/VERSION")],
+            "bump: version 1.0.0 → 1.1.0",
+            "1.1.0",
+        )
+    finally:
+        git_api._runner.close()
+
+    assert git("ls-tree", "-r", "--name-only", "HEAD").split() == [
+        "sub/.cz/config.py",
+        "sub/VERSION",
+        "sub/pkg/VERSION",
+    ]
+    assert git("show", "HEAD:sub/pkg/VERSION") == "1.1.0\n"
+    assert git("rev-parse", "HEAD") == git("rev-parse", "1.1.0^{commit}")
+    assert git("status", "--porcelain", "--untracked-files=no") == ""
+    assert git("log", "-1", "--format=%B") == "bump: version 1.0.0 → 1.1.0\n\n"
+
+
+def test_commit_and_tag_untracked_file(repository: Path, git: GitFunc) -> None:
+    Path(f"{repository}/VERSION").write_text("1.0.0\n")
+    git("add", "-A")
+    git("commit", "-q", "-m", "chore: init")
+    Path(f"{repository}/VERSION").write_text("1.1.0\n")
+    Path(f"{repository}/NEW_VERSION").write_text("1.1.0\n")
+
+    git_api = GitAPI(CommitizenConfig.load(repository))
+    try:
+        git_api.commit_and_tag(
+            [Path(f"{repository}/VERSION"), Path(f"{repository}/NEW_VERSION")],
+            "bump: version 1.0.0 → 1.1.0",
+            "1.1.0",
+        )
+    finally:
+        git_api._runner.close()
+
+    assert git("show", "HEAD:NEW_VERSION") == "1.1.0\n"
+    assert git("status", "--porcelain", "--", "VERSION", "NEW_VERSION") == ""
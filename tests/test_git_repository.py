@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from cz.git.pack import OFS_DELTA
+from cz.git.pack import REF_DELTA
+from cz.git.pack import PackFile
+from cz.git.repository import Repository
+
+from .conftest import GitFunc
+
+
+@pytest.fixture
+def history(tmp_path: Path, git: GitFunc) -> Path:
+    # Small edits of the same files, so a repack stores most versions as deltas.
+    lines = [f"line {i} of a file that is long enough to be worth a delta\n" for i in range(200)]
+    for i in range(30):
+        lines[i * 5] = f"changed in commit {i}\n"
+        Path(f"{tmp_path}/file.txt").write_text("".join(lines))
+        Path(f"{tmp_path}/data.bin").write_bytes(bytes(range(256)) * 20 + bytes([i]) * i)
+        git("add", "-A")
+        git("commit", "-q", "-m", f"feat: commit {i}")
+        if i % 10 == 9:
+            git("tag", "-a", f"0.{i // 10}.0", "-m", f"release 0.{i // 10}.0")
+    git("checkout", "-q", "-b", "topic", "HEAD~3")
+    Path(f"{tmp_path}/topic.txt").write_text("topic\n")
+    git("add", "-A")
+    git("commit", "-q", "-m", "feat: topic")
+    git("checkout", "-q", "main")
+    git("merge", "-q", "--no-ff", "-m", "feat: merge topic", "topic")
+    return tmp_path
+
+
+def _cat_all_objects(path: Path) -> dict[str, tuple[str, bytes]]:
+    output = subprocess.run(
+        ["git", "cat-file", "--batch-all-objects", "--batch"],
+        cwd=path,
+        check=True,
+        capture_output=True,
+    ).stdout
+    objects: dict[str, tuple[str, bytes]] = {}
+    position = 0
+    while position < len(output):
+        newline = output.index(b"\n", position)
+        sha, object_type, size = output[position:newline].decode("ascii").split(" ")
+        start = newline + 1
+        objects[sha] = (object_type, output[start : start + int(size)])
+        position = start + int(size) + 1
+    return objects
+
+
+def _pack_object_types(path: Path) -> set[int]:
+    object_types: set[int] = set()
+    for pack_path in Path(f"{path}/.git/objects/pack").glob("*.pack"):
+        pack = PackFile(pack_path)
+        try:
+            for i in range(pack.index.count):
+                object_types.add(pack._read_header(pack.index._offset(i))[0])
+        finally:
+            pack.index.close()
+            pack._data.close()
+    return object_types
+
+
+def _assert_reads_like_cat_file(path: Path) -> None:
+    expected = _cat_all_objects(path)
+    repository = Repository(path)
+    try:
+        for sha, obj in expected.items():
+            assert repository.objects.read(sha) == obj, sha
+    finally:
+        repository.close()
+
+
+def test_read_loose_objects(history: Path) -> None:
+    assert not list(Path(f"{history}/.git/objects/pack").glob("*.pack"))
+    _assert_reads_like_cat_file(history)
+
+
+def test_read_ofs_deltas(history: Path, git: GitFunc) -> None:
+    git("gc", "-q", "--aggressive", "--prune=now")
+    assert OFS_DELTA in _pack_object_types(history)
+    _assert_reads_like_cat_file(history)
+
+
+def test_read_ref_deltas(history: Path, git: GitFunc) -> None:
+    git("-c", "repack.useDeltaBaseOffset=false", "repack", "-q", "-a", "-d", "-f")
+    git("prune-packed")
+    assert REF_DELTA in _pack_object_types(history)
+    _assert_reads_like_cat_file(history)
+
+
+def test_read_packed_and_loose_objects(history: Path, git: GitFunc) -> None:
+    git("gc", "-q", "--aggressive", "--prune=now")
+    Path(f"{history}/file.txt").write_text("rewritten\n")
+    git("commit", "-q", "-am", "fix: loose commit")
+    _assert_reads_like_cat_file(history)
+
+
+@pytest.mark.parametrize(
+    "rev",
+    [
+        "HEAD",
+        "HEAD~2",
+        "HEAD^2",
+        "HEAD^2~1",
+        "HEAD^2^",
+        "HEAD~1^1~3",
+        "0.1.0~4",
+        "main^0",
+        "topic~",
+    ],
+)
+def test_resolve(history: Path, git: GitFunc, rev: str) -> None:
+    git("gc", "-q")
+    repository = Repository(history)
+    try:
+        assert repository.resolve(rev) == git("rev-parse", f"{rev}^{{commit}}").strip()
+    finally:
+        repository.close()
+
+
+@pytest.mark.parametrize("rev", ["HEAD^3", "HEAD~40", "HEAD@{1}", "HEAD^{tree}", "HEAD:file.txt"])
+def test_resolve_errors(history: Path, rev: str) -> None:
+    repository = Repository(history)
+    try:
+        with pytest.raises(ValueError):
+            repository.resolve(rev)
+    finally:
+        repository.close()
+
+
+def test_walk_shallow_clone(history: Path, tmp_path_factory: pytest.TempPathFactory) -> None:
+    clone = tmp_path_factory.mktemp("shallow")
+    subprocess.run(
+        ["git", "clone", "-q", "--depth", "3", f"file://{history}", f"{clone}"],
+        check=True,
+    )
+    expected = subprocess.run(
+        ["git", "rev-list", "HEAD"], cwd=clone, check=True, capture_output=True, text=True
+    ).stdout.split()
+    repository = Repository(clone)
+    try:
+        assert [sha for sha, _ in repository.walk("HEAD")] == expected
+    finally:
+        repository.close()
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from cz.git import runner as runner_module
+from cz.git.runner import PersistentGitRunner
+
+from .conftest import GitFunc
+
+
+@pytest.fixture
+def blobs(tmp_path: Path, git: GitFunc) -> list[str]:
+    shas: list[str] = []
+    for i in range(3):
+        Path(f"{tmp_path}/file{i}").write_text(f"content {i}\n" * (i + 1) * 100)
+        shas.append(git("hash-object", "-w", f"file{i}").strip())
+    return shas
+
+
+def test_interrupted_reply(
+    tmp_path: Path, git: GitFunc, blobs: list[str], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    read = runner_module._BatchProcess.read
+    calls: list[int] = []
+
+    def interrupted_read(self: runner_module._BatchProcess, size: int) -> bytes:
+        calls.append(size)
+        if len(calls) == 1:
+            self.stdout.read(size // 2)
+            raise KeyboardInterrupt
+        return read(self, size)
+
+    monkeypatch.setattr(runner_module._BatchProcess, "read", interrupted_read)
+    runner = PersistentGitRunner(tmp_path)
+    try:
+        with pytest.raises(KeyboardInterrupt):
+            runner.cat_file(blobs[0])
+        # the rest of the first reply must not be read as the answer to later requests
+        for sha in blobs:
+            result = runner.cat_file(sha)
+            assert result is not None
+            assert result[2] == git("cat-file", "blob", sha).encode("utf-8")
+        assert runner.batch_check(blobs[1]) == (blobs[1], "blob", 2 * 100 * len("content 1\n"))
+        # the interrupted process was killed and replaced, not kept next to its replacement
+        assert sorted(process.mode for process in runner._processes) == ["--batch", "--batch-check"]
+    finally:
+        runner.close()
+
+
+def test_interrupted_request(
+    tmp_path: Path, blobs: list[str], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    request = runner_module._BatchProcess.request
+    calls: list[str] = []
+
+    def failing_request(self: runner_module._BatchProcess, rev: str) -> bytes:
+        calls.append(rev)
+        if len(calls) == 1:
+            self.stdin.write(f"{rev}\n".encode("utf-8"))
+            self.stdin.flush()
+            raise OSError("interrupted")
+        return request(self, rev)
+
+    monkeypatch.setattr(runner_module._BatchProcess, "request", failing_request)
+    runner = PersistentGitRunner(tmp_path)
+    try:
+        with pytest.raises(OSError):
+            runner.batch_check(blobs[0])
+        assert runner.batch_check(blobs[2]) == (blobs[2], "blob", 3 * 100 * len("content 2\n"))
+        assert runner.batch_check("0" * 40) is None
+    finally:
+        runner.close()
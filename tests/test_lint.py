@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from cz.api.cz import CommitizenAPI
+from cz.config import CommitizenConfig
+from cz.conventional_commits.message.footer import BaseFooter
+from cz.conventional_commits.message.parser import MessageParser
+from cz.exceptions import InvalidCommitMessageError
+
+from .conftest import GitFunc
+
+
+def _commit(git: GitFunc, message: str) -> str:
+    git("commit", "-q", "--allow-empty", "-m", message)
+    return git("rev-parse", "HEAD").strip()
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_range_with_bare_breaking_change(repository: Path, git: GitFunc, jobs: int) -> None:
+    bad_type = _commit(git, "wip: not a type")
+    _commit(git, "feat: valid")
+    bare_footer = _commit(git, "feat!: bare footer\n\nbody\n\nBREAKING CHANGE:")
+    no_blank_line = _commit(git, "fix: no blank line\nbody")
+
+    api = CommitizenAPI(CommitizenConfig.load(repository))
+    try:
+        errors = {error.hash: error for error in api.cc.iter_lint_errors(jobs=jobs)}
+    finally:
+        api.close()
+    assert sorted(errors) == sorted([bad_type, bare_footer, no_blank_line])
+    assert errors[bad_type].rule == "first-line"
+    assert (errors[bare_footer].rule, errors[bare_footer].line) == ("footer:BREAKING CHANGE", 5)
+    assert errors[no_blank_line].line == 2
+
+
+def test_footer_class_crash(repository: Path) -> None:
+    class CrashingFooter(BaseFooter):
+        PREFIX = "Crash"
+
+        @classmethod
+        def ask(cls, message: Any, question: Any) -> None:
+            pass
+
+        def validete_footer(self, message: Any, footer: Any) -> None:
+            raise KeyError("boom")
+
+    config = CommitizenConfig.load(repository)
+    parser = MessageParser(config.commit_types, {CrashingFooter.PREFIX: CrashingFooter})
+    with pytest.raises(InvalidCommitMessageError) as exc_info:
+        parser.parse("feat: subject\n\nbody\n\nCrash: now")
+    assert (exc_info.value.rule, exc_info.value.line) == ("footer:Crash", 5)
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any
+
+from cz.api.cz import CommitizenAPI
+from cz.config import CommitizenConfig
+
+from .conftest import GitFunc
+
+
+def _commit(git: GitFunc, message: str) -> None:
+    git("commit", "-q", "--allow-empty", "-m", message)
+
+
+def _read(repository: Path, jobs: int) -> tuple[Any, ...]:
+    api = CommitizenAPI(CommitizenConfig.load(repository))
+    try:
+        api.cc.get_tags()
+        commits = api.cc.get_commits(is_version=True, unreleased_version="9.9.9", jobs=jobs)
+        version_groups = {
+            tag.name: [
+                commit.hash.long
+                for commit_group in version_group.commit_groups.values()
+                for commit in commit_group.commits
+            ]
+            for tag, version_group in api.global_variables.version_groups.items()
+        }
+        history = api.cc.get_history(unreleased_version="9.9.9", jobs=jobs)
+        history_hashes = [history.hash(row) for row in range(len(history))]
+        return list(commits), version_groups, history_hashes, history.version_ranges
+    finally:
+        api.close()
+
+
+def test_tags_out_of_semver_order(repository: Path, git: GitFunc) -> None:
+    # 1.5.0 is tagged after 2.0.0, so sorting the tags by version would overlap the ranges.
+    for version in ("1.0.0", "2.0.0", "1.5.0"):
+        _commit(git, f"feat: before {version}")
+        _commit(git, f"fix: {version}")
+        git("tag", version)
+    _commit(git, "feat: unreleased")
+
+    serial = _read(repository, 1)
+    assert serial == _read(repository, 2)
+    assert len(serial[0]) == 7
+    assert serial[3] == {"9.9.9": (0, 1), "1.5.0": (1, 3), "2.0.0": (3, 5), "1.0.0": (5, 7)}
+
+
+def test_interleaved_branches(repository: Path, git: GitFunc) -> None:
+    # The log interleaves both sides of the merge, so the ranges cannot be logged apart.
+    _commit(git, "feat: root")
+    git("tag", "0.1.0")
+    git("checkout", "-q", "-b", "topic")
+    _commit(git, "feat: topic")
+    git("checkout", "-q", "main")
+    _commit(git, "fix: main")
+    git("tag", "0.1.1")
+    git("merge", "-q", "--no-ff", "-m", "feat: merge topic", "topic")
+    git("tag", "0.2.0")
+    _commit(git, "fix: after merge")
+
+    assert _read(repository, 1) == _read(repository, 3)
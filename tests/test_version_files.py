@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import Union
+
+import pytest
+from semver.version import Version
+
+from cz.versioning import BaseVersionFile
+from cz.versioning import JSONVersionFile
+from cz.versioning import RegexVersionFile
+from cz.versioning import VersionFiles
+from cz.versioning import files
+
+MODULE_PATTERN = r'^__version__ = "(?P<version>[^"\n]+)"'
+
+
+class BrokenVersionFile(BaseVersionFile):
+    # A file that is not a SpanVersionFile, saved after the others and failing to.
+    def __init__(self, path: Path) -> None:
+        self.path = path
+
+    def get_path(self) -> Path:
+        return self.path
+
+    def get_version(self) -> str:
+        return "1.2.3"
+
+    def set_version(self, version: str) -> None:
+        pass
+
+    def save(self) -> None:
+        raise OSError("cannot save")
+
+
+@pytest.fixture
+def version_files(tmp_path: Path) -> list[BaseVersionFile]:
+    result: list[BaseVersionFile] = []
+    for i in range(4):
+        json_path = Path(f"{tmp_path}/package{i}.json")
+        json_path.write_text(f'{{\n  "name": "package{i}",\n  "version": "1.2.3"\n}}\n')
+        result.append(JSONVersionFile(json_path))
+        module_path = Path(f"{tmp_path}/module{i}.py")
+        module_path.write_text(f'# module {i}\n__version__ = "1.2.3"\n')
+        result.append(RegexVersionFile(module_path, MODULE_PATTERN))
+    return result
+
+
+def _contents(tmp_path: Path) -> dict[str, str]:
+    return {path.name: path.read_text() for path in sorted(tmp_path.iterdir())}
+
+
+def test_set_version(tmp_path: Path, version_files: list[BaseVersionFile]) -> None:
+    before = _contents(tmp_path)
+    VersionFiles(version_files).set_version(Version.parse("2.0.0"))
+    after = _contents(tmp_path)
+    assert after.keys() == before.keys()
+    for name, text in before.items():
+        assert after[name] == text.replace('"1.2.3"', '"2.0.0"')
+    assert VersionFiles(version_files).get_version() == Version.parse("2.0.0")
+
+
+def test_get_version_mismatch(tmp_path: Path, version_files: list[BaseVersionFile]) -> None:
+    Path(f"{tmp_path}/module2.py").write_text('__version__ = "1.2.4"\n')
+    with pytest.raises(RuntimeError):
+        VersionFiles(version_files).get_version()
+
+
+def test_get_version_invalid(tmp_path: Path, version_files: list[BaseVersionFile]) -> None:
+    Path(f"{tmp_path}/package3.json").write_text('{"version": "one"}')
+    with pytest.raises(RuntimeError, match="not version format"):
+        VersionFiles(version_files).get_version()
+
+
+def test_stage_failure(
+    tmp_path: Path, version_files: list[BaseVersionFile], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    write_temporary = files.write_temporary
+
+    def fail_module1(path: Path, data: bytes) -> str:
+        if path.name == "module1.py":
+            raise OSError("disk full")
+        return write_temporary(path, data)
+
+    monkeypatch.setattr(files, "write_temporary", fail_module1)
+    before = _contents(tmp_path)
+    with pytest.raises(OSError, match="disk full"):
+        VersionFiles(version_files).set_version(Version.parse("2.0.0"))
+    # nothing is renamed and every staged temporary file is removed
+    assert _contents(tmp_path) == before
+
+
+def test_commit_failure(
+    tmp_path: Path, version_files: list[BaseVersionFile], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    replace = os.replace
+    failed: list[str] = []
+
+    def fail_package2_once(src: Union[str, Path], dst: Union[str, Path]) -> None:
+        if Path(dst).name == "package2.json" and not failed:
+            failed.append(f"{dst}")
+            raise OSError("rename failed")
+        replace(src, dst)
+
+    monkeypatch.setattr(files.os, "replace", fail_package2_once)
+    before = _contents(tmp_path)
+    with pytest.raises(OSError, match="rename failed"):
+        VersionFiles(version_files).set_version(Version.parse("2.0.0"))
+    # the files renamed before package2.json are put back
+    assert failed
+    assert _contents(tmp_path) == before
+
+
+def test_other_file_failure(tmp_path: Path, version_files: list[BaseVersionFile]) -> None:
+    before = _contents(tmp_path)
+    broken = BrokenVersionFile(Path(f"{tmp_path}/broken"))
+    with pytest.raises(OSError, match="cannot save"):
+        VersionFiles([broken, *version_files]).set_version(Version.parse("2.0.0"))
+    assert _contents(tmp_path) == before
+
+
+def test_rollback(tmp_path: Path, version_files: list[BaseVersionFile]) -> None:
+    before = _contents(tmp_path)
+    transaction = VersionFiles(version_files)
+    transaction.set_version(Version.parse("2.0.0"))
+    assert _contents(tmp_path) != before
+    transaction.rollback()
+    assert _contents(tmp_path) == before
+    assert transaction.get_version() == Version.parse("1.2.3")
+    # a second rollback has nothing left to put back
+    transaction.rollback()
+    assert _contents(tmp_path) == before
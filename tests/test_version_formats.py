@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import re
+from pathlib import Path
+
+import pytest
+
+from cz.versioning import JSONVersionFile
+from cz.versioning import RegexVersionFile
+from cz.versioning import SpanVersionFile
+from cz.versioning import TOMLVersionFile
+
+PYPROJECT = (
+    b"# project file\r\n"
+    b"[tool.black]\r\n"
+    b'version = "not this one"\r\n'
+    b"\r\n"
+    b"[tool.poetry]  # the package\r\n"
+    b'name = "demo"\r\n'
+    b"description = '''\r\n"
+    b'version = "inside a string"\r\n'
+    b"'''\r\n"
+    b'    version   =   "1.2.3"   # keep me\r\n'
+    b'authors = ["A <a@example.com>"]\r\n'
+)
+
+PACKAGE_JSON = (
+    b"{\n"
+    b'  "name": "demo",\n'
+    b'  "scripts": {"version": "echo 0.0.0"},\n'
+    b'  "version"  :  "1.2.3",\n'
+    b'  "tags": ["\\u00e9t\\u00e9", 1.5e3, null]\n'
+    b"}\n"
+)
+
+MODULE = '"""Module."""\n__version__ = "1.2.3"\n\n# 日本語のコメント\nVALUE = 1\n'.encode()
+
+MODULE_REGEX = re.compile(r'^__version__ = "(?P<version>[^"\n]+)"', re.MULTILINE)
+
+
+def _create(name: str, path: Path) -> SpanVersionFile:
+    if name.endswith(".toml"):
+        return TOMLVersionFile(path, ("tool", "poetry", "version"))
+    if name.endswith(".json"):
+        return JSONVersionFile(path)
+    return RegexVersionFile(path, MODULE_REGEX)
+
+
+def _write(tmp_path: Path, name: str, data: bytes) -> Path:
+    path = Path(f"{tmp_path}/{name}")
+    path.write_bytes(data)
+    return path
+
+
+@pytest.mark.parametrize(
+    "name, data",
+    [("pyproject.toml", PYPROJECT), ("package.json", PACKAGE_JSON), ("__version__.py", MODULE)],
+)
+def test_only_the_version_changes(tmp_path: Path, name: str, data: bytes) -> None:
+    path = _write(tmp_path, name, data)
+    path.chmod(0o640)
+    version_file = _create(name, path)
+    assert version_file.get_version() == "1.2.3"
+    version_file.set_version("10.0.0-rc.1")
+    version_file.save()
+    assert path.read_bytes() == data.replace(b'"1.2.3"', b'"10.0.0-rc.1"')
+    assert path.stat().st_mode & 0o777 == 0o640
+    assert _create(name, path).get_version() == "10.0.0-rc.1"
+    # no temporary file is left behind
+    assert list(tmp_path.iterdir()) == [path]
+
+
+@pytest.mark.parametrize(
+    "name, data, message",
+    [
+        ("pyproject.toml", b'[tool.poetry]\nname = "demo"\n', "is not a plain string"),
+        ("pyproject.toml", b"[tool.poetry]\nversion = 1\n", "is not a plain string"),
+        ("pyproject.toml", b'[tool.poetry]\nversion = "1.\\u0032.3"\n', "is not a plain string"),
+        ("package.json", b'{"name": "demo"}', "version is missing"),
+        ("package.json", b'{"version": ["1.2.3"]}', "is not a plain string"),
+        ("package.json", b'{"version": "1.\\u0032.3"}', "is not a plain string"),
+        ("__version__.py", b'VERSION = "1.2.3"\n', "does not match"),
+    ],
+)
+def test_no_match(tmp_path: Path, name: str, data: bytes, message: str) -> None:
+    path = _write(tmp_path, name, data)
+    with pytest.raises(RuntimeError, match=message):
+        _create(name, path).get_version()
+
+
+@pytest.mark.parametrize(
+    "name, data, message",
+    [
+        (
+            "pyproject.toml",
+            b'[tool.poetry]\nversion = "1.2.3"\nversion = "1.2.4"\n',
+            "not valid TOML",
+        ),
+        (
+            "pyproject.toml",
+            b'[tool.poetry]\nversion = "1.2.3"\n[tool]\npoetry.version = "1.2.4"\n',
+            "not valid TOML",
+        ),
+        ("package.json", b'{"version": "1.2.3", "version": "1.2.4"}', "more than once"),
+        ("__version__.py", b'__version__ = "1.2.3"\n__version__ = "1.2.4"\n', "more than once"),
+    ],
+)
+def test_multiple_matches(tmp_path: Path, name: str, data: bytes, message: str) -> None:
+    path = _write(tmp_path, name, data)
+    with pytest.raises(RuntimeError, match=message):
+        _create(name, path).get_version()
+    assert path.read_bytes() == data